@@ -1,8 +1,22 @@
 import os
+import re
 import json
-from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify
+import sqlite3
+import threading
+import base64
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response, stream_with_context, abort
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, object_session, selectinload
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from http_utils import ProviderError
+from identifier_utils import IDENTIFIER_TYPES, InvalidIdentifier, normalize_identifier, canonical_barcode
+from suggest_utils import PrefixIndex, SUGGESTION_KINDS, DEFAULT_SUGGESTION_LIMIT
+from fuzzy_utils import TitleIndex
+from rules_utils import InvalidRule, parse_rules, describe_rules
 
 # Get base directory path
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -17,25 +31,76 @@ def inject_now():
 
 # Config
 app.config['SECRET_KEY'] = os.urandom(24)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'mydb.sqlite3')
+app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.environ.get('MOVIE_DB_PATH', os.path.join(basedir, 'mydb.sqlite3'))
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['IMPORT_SPOOL_DIR'] = os.path.join(basedir, 'import_spool')
+
+# SQLite pragma profiles applied to every new connection
+SQLITE_PRAGMA_PROFILES = {
+    # Concurrent readers alongside one writer, waiting on locks instead of failing
+    'production': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,       # 64 MB page cache (negative values are KiB)
+        'mmap_size': 268435456,     # 256 MB memory-mapped I/O
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+    # Same, but every commit is synced to disk
+    'durable': {
+        'journal_mode': 'WAL',
+        'busy_timeout': 5000,
+        'synchronous': 'FULL',
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    },
+}
+app.config['SQLITE_PRAGMA_PROFILE'] = os.environ.get('SQLITE_PRAGMA_PROFILE', 'production')
+
+# Pooled connections shared by request threads, import jobs and lookup workers
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 10,
+    'pool_timeout': 30,
+    'connect_args': {'check_same_thread': False},
+}
+
+@event.listens_for(Engine, 'connect')
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Apply the configured pragma profile to each new SQLite connection
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    
+    pragmas = SQLITE_PRAGMA_PROFILES[app.config['SQLITE_PRAGMA_PROFILE']]
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        cursor.execute(f'PRAGMA {name}={value}')
+    cursor.close()
 
 # Initialize database
 db = SQLAlchemy(app)
 # Define models based on our database schema
 class Movie(db.Model):
     __tablename__ = 'movies'
+    __table_args__ = (
+        # Backs keyset pagination of the library index (newest first)
+        db.Index('ix_movies_date_added_movie_id', 'date_added', 'movie_id'),
+    )
     
     movie_id = db.Column(db.Integer, primary_key=True)
-    title = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=False, index=True)
     release_year = db.Column(db.Integer)
     runtime_minutes = db.Column(db.Integer)
     synopsis = db.Column(db.Text)
     poster_url = db.Column(db.String(255))
-    upc = db.Column(db.String(50))
-    isbn = db.Column(db.String(50))
-    imdb_id = db.Column(db.String(20))
-    tmdb_id = db.Column(db.String(20))
+    # Identifier indexes are not unique: the same film can be owned in several formats
+    upc = db.Column(db.String(50), index=True)
+    isbn = db.Column(db.String(50), index=True)
+    imdb_id = db.Column(db.String(20), index=True)
+    tmdb_id = db.Column(db.String(20), index=True)
     format = db.Column(db.String(50))
     rating = db.Column(db.Float)
     watch_status = db.Column(db.Boolean, default=False)
@@ -48,6 +113,14 @@ class Movie(db.Model):
     people = db.relationship('Person', secondary='movie_people', backref='movies')
     collections = db.relationship('Collection', secondary='movie_collections', backref='movies')
     tags = db.relationship('Tag', secondary='movie_tags', backref='movies')
+    # Credits expose role_type and character_name, which the secondary people relationship hides
+    credits = db.relationship('MoviePerson', viewonly=True)
+
+# Case-insensitive title lookups, e.g. lower(title) = ? AND release_year = ?
+db.Index('ix_movies_title_lower_release_year', db.func.lower(Movie.title), Movie.release_year)
+
+# Backs keyset pagination in title order, e.g. the collection movie picker
+db.Index('ix_movies_title_lower_movie_id', db.func.lower(Movie.title), Movie.movie_id)
 
 class Genre(db.Model):
     __tablename__ = 'genres'
@@ -59,22 +132,24 @@ class MovieGenre(db.Model):
     __tablename__ = 'movie_genres'
     
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.movie_id', ondelete='CASCADE'), primary_key=True)
-    genre_id = db.Column(db.Integer, db.ForeignKey('genres.genre_id', ondelete='CASCADE'), primary_key=True)
+    genre_id = db.Column(db.Integer, db.ForeignKey('genres.genre_id', ondelete='CASCADE'), primary_key=True, index=True)
 
 class Person(db.Model):
     __tablename__ = 'people'
     
     person_id = db.Column(db.Integer, primary_key=True)
-    name = db.Column(db.String(100), nullable=False)
+    name = db.Column(db.String(100), nullable=False, index=True)
     profile_url = db.Column(db.String(255))
 
 class MoviePerson(db.Model):
     __tablename__ = 'movie_people'
     
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.movie_id', ondelete='CASCADE'), primary_key=True)
-    person_id = db.Column(db.Integer, db.ForeignKey('people.person_id', ondelete='CASCADE'), primary_key=True)
+    person_id = db.Column(db.Integer, db.ForeignKey('people.person_id', ondelete='CASCADE'), primary_key=True, index=True)
     role_type = db.Column(db.String(50), nullable=False, primary_key=True)
     character_name = db.Column(db.String(100))
+    
+    person = db.relationship('Person', viewonly=True)
 
 class Collection(db.Model):
     __tablename__ = 'collections'
@@ -82,12 +157,14 @@ class Collection(db.Model):
     collection_id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
+    # JSON rules for smart collections (see rules_utils); NULL for hand-curated collections
+    rules = db.Column(db.Text)
 
 class MovieCollection(db.Model):
     __tablename__ = 'movie_collections'
     
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.movie_id', ondelete='CASCADE'), primary_key=True)
-    collection_id = db.Column(db.Integer, db.ForeignKey('collections.collection_id', ondelete='CASCADE'), primary_key=True)
+    collection_id = db.Column(db.Integer, db.ForeignKey('collections.collection_id', ondelete='CASCADE'), primary_key=True, index=True)
 
 class Tag(db.Model):
     __tablename__ = 'tags'
@@ -99,7 +176,7 @@ class MovieTag(db.Model):
     __tablename__ = 'movie_tags'
     
     movie_id = db.Column(db.Integer, db.ForeignKey('movies.movie_id', ondelete='CASCADE'), primary_key=True)
-    tag_id = db.Column(db.Integer, db.ForeignKey('tags.tag_id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.tag_id', ondelete='CASCADE'), primary_key=True, index=True)
 
 class ImportLog(db.Model):
     __tablename__ = 'import_logs'
@@ -111,29 +188,726 @@ class ImportLog(db.Model):
     records_total = db.Column(db.Integer)
     records_imported = db.Column(db.Integer)
     error_message = db.Column(db.Text)
+    
+    # Background job progress
+    records_skipped = db.Column(db.Integer)
+    records_failed = db.Column(db.Integer)
+    bytes_total = db.Column(db.Integer)
+    bytes_processed = db.Column(db.Integer)
+    skip_duplicates = db.Column(db.Boolean, default=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+class Barcode(db.Model):
+    __tablename__ = 'barcodes'
+    
+    # Normalized UPC/EAN/ISBN digits; UPC-A and ISBN-13 share the EAN-13 code space
+    barcode = db.Column(db.String(20), primary_key=True)
+    barcode_type = db.Column(db.String(10), nullable=False)
+    movie_id = db.Column(db.Integer, db.ForeignKey('movies.movie_id', ondelete='SET NULL'), index=True)
+    imdb_id = db.Column(db.String(20))
+    tmdb_id = db.Column(db.String(20))
+    movie_data = db.Column(db.Text)  # Provider result JSON for barcodes seen but not in the library; expires, see SCAN_RESULT_TTL
+    source = db.Column(db.String(20), nullable=False)  # 'library', 'import' or 'scan'
+    last_seen = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# Full-text search index
+# A standalone FTS5 table keyed by movie_id, with people and genre names denormalized in
+# Triggers keep it in sync with every write path; the bulk import pauses them and indexes each batch at once
+
+# bm25 weights in column order: title, synopsis, people, genres, personal_notes
+SEARCH_COLUMN_WEIGHTS = (10.0, 1.0, 5.0, 3.0, 2.0)
+
+def search_documents_sql(movie_ids):
+    """
+    SQL indexing the movies whose ids the movie_ids expression yields
+    """
+    return f"""
+        INSERT INTO movies_fts (rowid, title, synopsis, people, genres, personal_notes)
+        SELECT m.movie_id, m.title, m.synopsis,
+            (SELECT group_concat(p.name, ' ') FROM movie_people mp
+             JOIN people p ON p.person_id = mp.person_id WHERE mp.movie_id = m.movie_id),
+            (SELECT group_concat(g.name, ' ') FROM movie_genres mg
+             JOIN genres g ON g.genre_id = mg.genre_id WHERE mg.movie_id = m.movie_id),
+            m.personal_notes
+        FROM movies m WHERE m.movie_id IN ({movie_ids})
+    """
+
+def search_trigger_sql(name, trigger_event, movie_ids):
+    """
+    SQL for a trigger re-indexing the movies whose ids the movie_ids expression yields
+    Triggers do nothing while a row in movies_fts_paused says the index is being maintained in bulk
+    """
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {trigger_event} "
+        f"WHEN NOT EXISTS (SELECT 1 FROM movies_fts_paused) BEGIN "
+        f"DELETE FROM movies_fts WHERE rowid IN ({movie_ids}); {search_documents_sql(movie_ids)}; END"
+    )
+
+SEARCH_INDEX_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS movies_fts USING fts5(
+        title, synopsis, people, genres, personal_notes,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS movies_fts_paused (paused INTEGER NOT NULL DEFAULT 1)",
+    search_trigger_sql('movies_fts_insert', 'INSERT ON movies', 'new.movie_id'),
+    search_trigger_sql('movies_fts_update', 'UPDATE OF title, synopsis, personal_notes ON movies', 'new.movie_id'),
+    "CREATE TRIGGER IF NOT EXISTS movies_fts_delete AFTER DELETE ON movies "
+    "BEGIN DELETE FROM movies_fts WHERE rowid = old.movie_id; END",
+    search_trigger_sql('movie_people_fts_insert', 'INSERT ON movie_people', 'new.movie_id'),
+    search_trigger_sql('movie_people_fts_delete', 'DELETE ON movie_people', 'old.movie_id'),
+    search_trigger_sql('movie_genres_fts_insert', 'INSERT ON movie_genres', 'new.movie_id'),
+    search_trigger_sql('movie_genres_fts_delete', 'DELETE ON movie_genres', 'old.movie_id'),
+    search_trigger_sql('people_fts_update', 'UPDATE OF name ON people',
+                       'SELECT movie_id FROM movie_people WHERE person_id = new.person_id'),
+    search_trigger_sql('genres_fts_update', 'UPDATE OF name ON genres',
+                       'SELECT movie_id FROM movie_genres WHERE genre_id = new.genre_id'),
+]
+
+@event.listens_for(db.metadata, 'after_create')
+def create_search_index(target, connection, **kw):
+    """
+    Create the full-text index and its triggers with the tables, indexing existing movies on first creation
+    """
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movies_fts'"
+    ).first()
+    
+    for statement in SEARCH_INDEX_DDL:
+        connection.exec_driver_sql(statement)
+    
+    if not exists:
+        connection.exec_driver_sql(search_documents_sql('SELECT movie_id FROM movies'))
+
+@event.listens_for(db.metadata, 'before_drop')
+def drop_search_index(target, connection, **kw):
+    """
+    Drop the full-text index with the tables; its triggers go with the tables they belong to
+    """
+    connection.exec_driver_sql('DROP TABLE IF EXISTS movies_fts')
+    connection.exec_driver_sql('DROP TABLE IF EXISTS movies_fts_paused')
+
+def pause_search_index():
+    """
+    Stop the search triggers for the rest of this transaction, so bulk writes skip per-row re-indexing
+    Other connections are unaffected until commit, and the caller must call index_new_movies before then
+    """
+    db.session.execute(db.text('INSERT INTO movies_fts_paused DEFAULT VALUES'))
+
+def index_new_movies(movie_ids):
+    """
+    Index movies written while the search triggers were paused, then resume the triggers
+    """
+    db.session.execute(db.text('DELETE FROM movies_fts_paused'))
+    db.session.execute(
+        db.text(search_documents_sql('SELECT value FROM json_each(:movie_ids)')),
+        {'movie_ids': json.dumps(movie_ids)}
+    )
+
+# List view helpers
+# Columns needed to render a movie card; list views never touch the wide Text columns
+MOVIE_CARD_COLUMNS = (
+    Movie.movie_id,
+    Movie.title,
+    Movie.release_year,
+    Movie.format,
+    Movie.poster_url,
+    Movie.watch_status,
+    Movie.date_added,
+)
+
+def movie_card_query():
+    """
+    Query returning lightweight card rows instead of fully hydrated Movie objects
+    Rows support attribute access (movie.title), so templates can use them unchanged
+    """
+    return db.session.query(*MOVIE_CARD_COLUMNS)
+
+# Pagination helpers
+PAGE_SIZES = (24, 48, 96)
+DEFAULT_PAGE_SIZE = 48
+
+def encode_cursor(movie):
+    """
+    Encode a movie's (date_added, movie_id) sort key as an opaque URL-safe cursor
+    """
+    raw = f"{movie.date_added.isoformat()}|{movie.movie_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor created by encode_cursor
+    Returns a (date_added, movie_id) tuple, or None if the cursor is invalid
+    """
+    if not cursor:
+        return None
+    
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, movie_id = base64.urlsafe_b64decode(padded).decode('utf-8').split('|')
+        return datetime.fromisoformat(date_str), int(movie_id)
+    except ValueError:
+        return None
+
+def encode_title_cursor(sort_title, movie_id):
+    """
+    Encode a (lower(title), movie_id) sort key as an opaque URL-safe cursor
+    """
+    raw = f"{movie_id}|{sort_title}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_title_cursor(cursor):
+    """
+    Decode a cursor created by encode_title_cursor
+    Returns a (sort_title, movie_id) tuple, or None if the cursor is invalid
+    """
+    if not cursor:
+        return None
+    
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        movie_id, sort_title = base64.urlsafe_b64decode(padded).decode('utf-8').split('|', 1)
+        return sort_title, int(movie_id)
+    except ValueError:
+        return None
+
+def get_page_size():
+    """
+    Read the requested page size, falling back to the default for unknown values
+    """
+    per_page = request.args.get('per_page', type=int)
+    return per_page if per_page in PAGE_SIZES else DEFAULT_PAGE_SIZE
+
+def paginate_movies(query, per_page, after=None, before=None):
+    """
+    Keyset-paginate a Movie query on (date_added, movie_id), newest first
+    Only per_page + 1 rows are ever fetched, so cost does not grow with library size
+    Returns a tuple of (movies, next_cursor, prev_cursor)
+    """
+    sort_key = db.tuple_(Movie.date_added, Movie.movie_id)
+    
+    if before:
+        # Walk backwards from the cursor, then flip the page back to newest first
+        rows = (query.filter(sort_key > db.tuple_(*before))
+                .order_by(Movie.date_added.asc(), Movie.movie_id.asc())
+                .limit(per_page + 1)
+                .all())
+        movies = list(reversed(rows[:per_page]))
+        
+        if movies:
+            prev_cursor = encode_cursor(movies[0]) if len(rows) > per_page else None
+            return movies, encode_cursor(movies[-1]), prev_cursor
+        
+        # Nothing newer than the cursor any more, so start from the first page
+        after = None
+    
+    if after:
+        query = query.filter(sort_key < db.tuple_(*after))
+    
+    rows = (query.order_by(Movie.date_added.desc(), Movie.movie_id.desc())
+            .limit(per_page + 1)
+            .all())
+    movies = rows[:per_page]
+    
+    next_cursor = encode_cursor(movies[-1]) if len(rows) > per_page else None
+    prev_cursor = encode_cursor(movies[0]) if after and movies else None
+    
+    return movies, next_cursor, prev_cursor
 
 # Routes
 @app.route('/')
 def index():
-    movies = Movie.query.order_by(Movie.date_added.desc()).all()
-    return render_template('index.html', movies=movies)
+    per_page = get_page_size()
+    after = decode_cursor(request.args.get('after'))
+    before = decode_cursor(request.args.get('before'))
+    
+    movies, next_cursor, prev_cursor = paginate_movies(movie_card_query(), per_page, after=after, before=before)
+    
+    return render_template(
+        'index.html',
+        movies=movies,
+        per_page=per_page,
+        page_sizes=PAGE_SIZES,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor
+    )
+
+def load_movie_detail(movie_id):
+    """
+    Load a movie with its genres, tags, collections and credits (with people) in a fixed five queries
+    Returns None if there is no such movie
+    """
+    stmt = (
+        db.select(Movie)
+        .where(Movie.movie_id == movie_id)
+        .options(
+            selectinload(Movie.genres),
+            selectinload(Movie.tags),
+            selectinload(Movie.collections),
+            selectinload(Movie.credits).joinedload(MoviePerson.person),
+        )
+    )
+    return db.session.scalars(stmt).first()
+
+def group_credits(credits):
+    """
+    Group a movie's credits by role_type, e.g. {'director': [...], 'actor': [...]}
+    """
+    grouped = {}
+    for credit in credits:
+        grouped.setdefault(credit.role_type, []).append(credit)
+    return grouped
 
 @app.route('/movie/<int:movie_id>')
 def movie_detail(movie_id):
-    movie = Movie.query.get_or_404(movie_id)
-    return render_template('movie_detail.html', movie=movie)
+    movie = load_movie_detail(movie_id)
+    if movie is None:
+        abort(404)
+    return render_template('movie_detail.html', movie=movie, credits=group_credits(movie.credits))
+
+# Barcode index helpers
+BARCODE_TYPES = ('upc', 'isbn')
+
+# A provider's answer for a barcode nobody has added or linked to a library movie is only trusted this long;
+# after that the barcode is looked up again, so a wrong or outdated answer is not kept forever
+SCAN_RESULT_TTL = timedelta(days=30)
+
+def remembered_result(entry):
+    """
+    Return the remembered provider result of a barcode index entry, or None if there is none or it expired
+    """
+    if not entry.movie_data:
+        return None
+    if entry.last_seen is None or entry.last_seen < datetime.utcnow() - SCAN_RESULT_TTL:
+        return None
+    return json.loads(entry.movie_data)
+
+def index_barcodes(entries, source):
+    """
+    Upsert barcode index entries
+    entries is a list of dicts with barcode_type and barcode plus optional movie_id, imdb_id, tmdb_id and movie_data
+    A known movie_id is never cleared by a later entry without one
+    Codes failing validation are skipped, since no validated lookup could ever match them
+    """
+    rows = {}
+    for entry in entries:
+        barcode = canonical_barcode(entry.get('barcode'))
+        if barcode:
+            rows[barcode] = {
+                'barcode': barcode,
+                'barcode_type': entry['barcode_type'],
+                'movie_id': entry.get('movie_id'),
+                'imdb_id': entry.get('imdb_id'),
+                'tmdb_id': entry.get('tmdb_id'),
+                'movie_data': entry.get('movie_data'),
+                'source': source,
+                'last_seen': datetime.utcnow()
+            }
+    
+    for chunk in chunked(list(rows.values())):
+        stmt = sqlite_insert(Barcode)
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Barcode.barcode],
+            set_={
+                'movie_id': db.func.coalesce(excluded.movie_id, Barcode.movie_id),
+                'imdb_id': db.func.coalesce(excluded.imdb_id, Barcode.imdb_id),
+                'tmdb_id': db.func.coalesce(excluded.tmdb_id, Barcode.tmdb_id),
+                'movie_data': db.func.coalesce(excluded.movie_data, Barcode.movie_data),
+                'source': excluded.source,
+                'last_seen': excluded.last_seen
+            }
+        )
+        db.session.execute(stmt, chunk)
+
+def movie_barcode_entries(movie_id, movie_data):
+    """
+    Barcode index entries for the upc/isbn of a library movie
+    """
+    return [
+        {
+            'barcode_type': barcode_type,
+            'barcode': movie_data.get(barcode_type),
+            'movie_id': movie_id,
+            'imdb_id': movie_data.get('imdb_id'),
+            'tmdb_id': movie_data.get('tmdb_id')
+        }
+        for barcode_type in BARCODE_TYPES
+        if movie_data.get(barcode_type)
+    ]
+
+def backfill_barcodes():
+    """
+    Seed an empty barcode index from the upc/isbn values already stored on movies
+    """
+    if db.session.query(Barcode.barcode).first() is not None:
+        return
+    
+    rows = db.session.execute(
+        db.select(Movie.movie_id, Movie.upc, Movie.isbn, Movie.imdb_id, Movie.tmdb_id)
+        .where(db.or_(Movie.upc.isnot(None), Movie.isbn.isnot(None)))
+    ).mappings()
+    
+    entries = [entry for row in rows for entry in movie_barcode_entries(row['movie_id'], row)]
+    index_barcodes(entries, 'library')
+    db.session.commit()
+
+def library_movie_result(movie):
+    """
+    Format a library movie like a provider search result
+    """
+    people = db.session.execute(
+        db.select(Person.name, MoviePerson.role_type)
+        .join(MoviePerson, MoviePerson.person_id == Person.person_id)
+        .where(MoviePerson.movie_id == movie.movie_id)
+    ).all()
+    
+    result = {
+        'title': movie.title,
+        'release_year': movie.release_year,
+        'runtime_minutes': movie.runtime_minutes,
+        'synopsis': movie.synopsis,
+        'poster_url': movie.poster_url,
+        'imdb_id': movie.imdb_id,
+        'tmdb_id': movie.tmdb_id,
+        'upc': movie.upc,
+        'isbn': movie.isbn,
+        'directors': [name for name, role_type in people if role_type == 'director'],
+        'cast': [name for name, role_type in people if role_type == 'actor'],
+        'genres': [genre.name for genre in movie.genres],
+        'found': True
+    }
+    result['json_data'] = json.dumps(result)
+    
+    # Added after json_data, which is only used to add new movies
+    result['in_collection'] = True
+    result['movie_id'] = movie.movie_id
+    
+    return result
+
+def resolve_barcode(barcode):
+    """
+    Answer a lookup for a normalized barcode from the local index without any network call
+    Returns the library movie or the remembered provider result, or None if the barcode is unknown
+    or only has an expired provider result
+    """
+    entry = db.session.get(Barcode, barcode)
+    
+    if entry is None:
+        return None
+    
+    if entry.movie_id:
+        movie = db.session.get(Movie, entry.movie_id)
+        if movie:
+            return library_movie_result(movie)
+    
+    return remembered_result(entry)
+
+def resolve_barcodes(barcodes):
+    """
+    Answer many normalized barcode lookups from the local index with one query per table
+    Returns a dict of barcode to movie data for the barcodes the index can answer
+    """
+    entries = []
+    for chunk in chunked(list(set(barcodes))):
+        entries.extend(db.session.execute(db.select(Barcode).where(Barcode.barcode.in_(chunk))).scalars())
+    
+    movie_ids = [entry.movie_id for entry in entries if entry.movie_id]
+    movies = {}
+    for chunk in chunked(movie_ids):
+        for movie in db.session.execute(db.select(Movie).where(Movie.movie_id.in_(chunk))).scalars():
+            movies[movie.movie_id] = movie
+    
+    results = {}
+    for entry in entries:
+        if entry.movie_id in movies:
+            results[entry.barcode] = library_movie_result(movies[entry.movie_id])
+        else:
+            movie = remembered_result(entry)
+            if movie:
+                results[entry.barcode] = movie
+    
+    return results
+
+def remember_barcode_result(identifier_type, identifier_value, movie):
+    """
+    Record a barcode resolved by a provider in the barcode index, linked to the library movie if we own it
+    An answer not linked to a library movie is only reused for SCAN_RESULT_TTL
+    Returns the movie data with the barcode included, so adding it stores the barcode too
+    The caller commits
+    """
+    movie = dict(movie, **{identifier_type: identifier_value})
+    movie.pop('json_data', None)
+    movie['json_data'] = json.dumps(movie)
+    
+    owned = None
+    if movie.get('imdb_id'):
+        owned = db.session.query(Movie.movie_id).filter_by(imdb_id=movie['imdb_id']).first()
+    elif movie.get('tmdb_id'):
+        owned = db.session.query(Movie.movie_id).filter_by(tmdb_id=movie['tmdb_id']).first()
+    
+    index_barcodes([{
+        'barcode_type': identifier_type,
+        'barcode': identifier_value,
+        'movie_id': owned.movie_id if owned else None,
+        'imdb_id': movie.get('imdb_id'),
+        'tmdb_id': movie.get('tmdb_id'),
+        'movie_data': json.dumps(movie)
+    }], 'scan')
+    
+    return movie
+
+# Shown when a lookup failed because the providers are down or rate limited, not because nothing matched
+PROVIDERS_UNAVAILABLE_MESSAGE = 'Movie providers are unavailable right now, please try again in a moment'
+
+def find_movie_by_identifier(identifier_type, identifier_value):
+    """
+    Resolve a normalized identifier (see normalize_identifier), answering barcodes
+    from the local index before calling any provider
+    Barcodes resolved by a provider are remembered, linked to the library movie if we own it
+    Returns movie data if found, None otherwise; raises ProviderError when the providers cannot answer
+    """
+    if identifier_type in BARCODE_TYPES:
+        movie = resolve_barcode(identifier_value)
+        if movie:
+            return movie
+    
+    from search_utils import search_by_identifier
+    movie = search_by_identifier(identifier_type, identifier_value)
+    
+    if movie and identifier_type in BARCODE_TYPES:
+        movie = remember_barcode_result(identifier_type, identifier_value, movie)
+        db.session.commit()
+    
+    return movie
 
 # Search routes
+# 'online' searches TMDB, 'local' searches our own library
+SEARCH_MODES = ('online', 'local')
+LOCAL_SEARCH_LIMIT = 50
+MAX_LOCAL_SEARCH_LIMIT = 200
+
+def fts_match_query(text):
+    """
+    Turn free text into an FTS5 query matching every word, the last one as a prefix
+    Words are quoted, so FTS5 operators in user input are matched literally
+    Returns None if the text has no searchable words
+    """
+    words = re.findall(r'\w+', text.lower())
+    if not words:
+        return None
+    return ' '.join(f'"{word}"' for word in words) + '*'
+
+def search_library(text, limit=LOCAL_SEARCH_LIMIT):
+    """
+    Search the library's full-text index, best matches first (bm25)
+    Returns movie card rows with a synopsis snippet for each match
+    """
+    match = fts_match_query(text)
+    if match is None:
+        return []
+    
+    weights = ', '.join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS)
+    hits = db.text(
+        f"SELECT rowid AS movie_id, bm25(movies_fts, {weights}) AS rank, "
+        f"snippet(movies_fts, 1, '', '', '...', 16) AS snippet "
+        f"FROM movies_fts WHERE movies_fts MATCH :match ORDER BY rank LIMIT :limit"
+    ).bindparams(match=match, limit=limit).columns(
+        movie_id=db.Integer, rank=db.Float, snippet=db.String
+    ).subquery('hits')
+    
+    rows = (
+        movie_card_query()
+        .add_columns(hits.c.snippet)
+        .join(hits, hits.c.movie_id == Movie.movie_id)
+        .order_by(hits.c.rank)
+        .all()
+    )
+    
+    if rows:
+        return rows
+    
+    # Nothing matched word for word, so the query may be misspelled: fall back to fuzzy titles
+    movie_ids = [movie_id for _, _, _, movie_id in get_title_index().candidates(text, limit=limit)]
+    if not movie_ids:
+        return []
+    
+    by_id = {
+        row.movie_id: row
+        for row in movie_card_query().add_columns(db.null().label('snippet')).filter(Movie.movie_id.in_(movie_ids))
+    }
+    return [by_id[movie_id] for movie_id in movie_ids if movie_id in by_id]
+
 @app.route('/search')
 def search():
     query = request.args.get('query', '')
+    mode = request.args.get('mode', 'online')
+    if mode not in SEARCH_MODES:
+        mode = 'online'
     results = []
     
     if query:
-        from search_utils import search_movies_by_keyword
-        results = search_movies_by_keyword(query)
+        if mode == 'local':
+            results = search_library(query)
+        else:
+            from search_utils import search_movies_by_keyword
+            results = search_movies_by_keyword(query)
+    
+    return render_template('search.html', query=query, mode=mode, results=results)
+
+@app.route('/api/library/search')
+def api_search_library():
+    """
+    API endpoint to search the library by title, synopsis, cast, director, genre or notes.
+    Returns JSON with the best matches first; no provider is called.
+    """
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', LOCAL_SEARCH_LIMIT, type=int), 1), MAX_LOCAL_SEARCH_LIMIT)
+    
+    results = [
+        {
+            'movie_id': movie.movie_id,
+            'title': movie.title,
+            'release_year': movie.release_year,
+            'format': movie.format,
+            'poster_url': movie.poster_url,
+            'snippet': movie.snippet,
+            'url': url_for('movie_detail', movie_id=movie.movie_id)
+        }
+        for movie in search_library(query, limit)
+    ]
+    
+    return jsonify({'success': True, 'query': query, 'results': results})
+
+# Typeahead suggestions, served from memory without touching the database
+MAX_SUGGESTION_LIMIT = 25
+
+suggest_index = None
+suggest_index_lock = threading.Lock()
+
+def get_suggest_index():
+    """
+    Return the typeahead index, building it from the movies, people and genres tables on first use
+    """
+    global suggest_index
+    
+    if suggest_index is None:
+        with suggest_index_lock:
+            if suggest_index is None:
+                index = PrefixIndex()
+                index.build(
+                    [('title', title) for title in db.session.scalars(db.select(Movie.title).distinct())]
+                    + [('person', name) for name in db.session.scalars(db.select(Person.name))]
+                    + [('genre', name) for name in db.session.scalars(db.select(Genre.name))]
+                )
+                suggest_index = index
+    
+    return suggest_index
+
+def add_suggestions(kind, labels):
+    """
+    Add new labels to the typeahead index, if it has been built
+    """
+    if suggest_index is not None:
+        for label in labels:
+            suggest_index.add(kind, label)
+
+def queue_suggestions(session, kind, labels):
+    """
+    Hold new labels until the session commits, so rows that are rolled back never become suggestions
+    """
+    session.info.setdefault('pending_suggestions', []).extend((kind, label) for label in labels)
+
+
+# Fuzzy title index over the library, for duplicate detection and typo-tolerant search
+title_index = None
+title_index_lock = threading.Lock()
+
+def build_title_index():
+    """
+    Build a fuzzy title index of the library as it is in the database now
+    Matches carry the movie_id as their payload
+    """
+    index = TitleIndex()
+    for movie_id, title, release_year in db.session.execute(
+            db.select(Movie.movie_id, Movie.title, Movie.release_year)):
+        index.add(title, release_year, movie_id)
+    return index
+
+def get_title_index():
+    """
+    Return this process's fuzzy title index, building it on first use
+    It only learns about movies committed by this process, so it is fit for search and warnings;
+    CSV imports deduplicate against a fresh build_title_index() instead
+    """
+    global title_index
+    
+    if title_index is None:
+        with title_index_lock:
+            if title_index is None:
+                title_index = build_title_index()
     
-    return render_template('search.html', query=query, results=results)
+    return title_index
+
+def add_library_titles(movies):
+    """
+    Add new (movie_id, title, release_year) rows to the fuzzy title index, if it has been built
+    """
+    if title_index is not None:
+        for movie_id, title, release_year in movies:
+            title_index.add(title, release_year, movie_id)
+
+def queue_library_titles(session, movies):
+    """
+    Hold new (movie_id, title, release_year) rows until the session commits, like queue_suggestions
+    """
+    session.info.setdefault('pending_titles', []).extend(movies)
+
+# The in-memory indexes only learn about rows once they are committed
+@event.listens_for(Session, 'after_commit')
+def apply_pending_index_updates(session):
+    for kind, label in session.info.pop('pending_suggestions', []):
+        add_suggestions(kind, [label])
+    add_library_titles(session.info.pop('pending_titles', []))
+
+@event.listens_for(Session, 'after_rollback')
+def discard_pending_index_updates(session):
+    session.info.pop('pending_suggestions', None)
+    session.info.pop('pending_titles', None)
+
+@event.listens_for(Movie, 'after_insert')
+def index_inserted_movie(mapper, connection, movie):
+    session = object_session(movie)
+    queue_suggestions(session, 'title', [movie.title])
+    queue_library_titles(session, [(movie.movie_id, movie.title, movie.release_year)])
+
+@event.listens_for(Person, 'after_insert')
+def add_person_suggestion(mapper, connection, person):
+    queue_suggestions(object_session(person), 'person', [person.name])
+
+@event.listens_for(Genre, 'after_insert')
+def add_genre_suggestion(mapper, connection, genre):
+    queue_suggestions(object_session(genre), 'genre', [genre.name])
+
+@app.route('/api/suggest')
+def api_suggest():
+    """
+    API endpoint for typeahead completions of titles, people and genres.
+    Optional kinds=title,person,genre restricts the completions returned.
+    """
+    query = request.args.get('q', '')
+    limit = min(max(request.args.get('limit', DEFAULT_SUGGESTION_LIMIT, type=int), 1), MAX_SUGGESTION_LIMIT)
+    kinds = tuple(kind for kind in request.args.get('kinds', '').split(',') if kind in SUGGESTION_KINDS)
+    
+    suggestions = get_suggest_index().suggest(query, limit, kinds or SUGGESTION_KINDS)
+    
+    return jsonify({
+        'query': query,
+        'suggestions': [{'kind': kind, 'label': label} for kind, label in suggestions]
+    })
 
 @app.route('/search/identifier', methods=['GET', 'POST'])
 def search_identifier():
@@ -144,8 +918,18 @@ def search_identifier():
         identifier_value = request.form.get('identifier_value')
         
         if identifier_type and identifier_value:
-            from search_utils import search_by_identifier
-            results = search_by_identifier(identifier_type, identifier_value)
+            try:
+                identifier_value = normalize_identifier(identifier_type, identifier_value)
+            except InvalidIdentifier as e:
+                flash(f'Invalid {identifier_type}: {str(e)}', 'warning')
+                return render_template('search_identifier.html', results=None)
+            
+            try:
+                results = find_movie_by_identifier(identifier_type, identifier_value)
+            except ProviderError as e:
+                print(f"Identifier search error: {str(e)}")
+                flash(PROVIDERS_UNAVAILABLE_MESSAGE, 'warning')
+                return render_template('search_identifier.html', results=None)
             
             if not results:
                 flash(f'No movie found with {identifier_type}: {identifier_value}', 'warning')
@@ -171,9 +955,16 @@ def add_movie_from_search():
             existing_movie = Movie.query.filter_by(tmdb_id=movie_data['tmdb_id']).first()
         
         if existing_movie:
+            # A scanned barcode for a film we own resolves locally next time
+            index_barcodes(movie_barcode_entries(existing_movie.movie_id, movie_data), 'scan')
+            db.session.commit()
+            
             flash(f'Movie "{existing_movie.title}" already exists in your collection', 'info')
             return redirect(url_for('movie_detail', movie_id=existing_movie.movie_id))
         
+        # Providers and editions spell titles differently; look for a near match we already own
+        similar = get_title_index().find_duplicate(movie_data['title'], movie_data.get('release_year'))
+        
         # Create new movie
         new_movie = Movie(
             title=movie_data['title'],
@@ -181,6 +972,8 @@ def add_movie_from_search():
             runtime_minutes=movie_data.get('runtime_minutes'),
             synopsis=movie_data.get('synopsis'),
             poster_url=movie_data.get('poster_url'),
+            upc=movie_data.get('upc'),
+            isbn=movie_data.get('isbn'),
             imdb_id=movie_data.get('imdb_id'),
             tmdb_id=movie_data.get('tmdb_id')
         )
@@ -188,6 +981,8 @@ def add_movie_from_search():
         db.session.add(new_movie)
         db.session.flush()  # Get the movie_id without committing
         
+        index_barcodes(movie_barcode_entries(new_movie.movie_id, movie_data), 'library')
+        
         # Add genres
         for genre_name in movie_data.get('genres', []):
             genre = Genre.query.filter_by(name=genre_name).first()
@@ -230,6 +1025,8 @@ def add_movie_from_search():
         
         db.session.commit()
         flash(f'Movie "{new_movie.title}" added to your collection', 'success')
+        if similar:
+            flash(f'You may already own this movie as "{similar[1]}" ({similar[2] or "unknown year"})', 'warning')
         return redirect(url_for('movie_detail', movie_id=new_movie.movie_id))
         
     except Exception as e:
@@ -238,10 +1035,267 @@ def add_movie_from_search():
         return redirect(url_for('index'))
 
 # CSV Import routes
+# Bulk import helpers
+# Rows per executemany / IN (...) chunk, well under SQLite's bound parameter limit
+BULK_CHUNK_SIZE = 500
+
+# Movie columns accepted from parsed import rows
+MOVIE_IMPORT_FIELDS = (
+    'title', 'release_year', 'runtime_minutes', 'synopsis', 'poster_url', 'upc', 'isbn',
+    'imdb_id', 'tmdb_id', 'format', 'watch_status', 'personal_notes'
+)
+
+def chunked(items, size=BULK_CHUNK_SIZE):
+    """
+    Split a list into consecutive chunks of at most size items
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def resolve_names(model, id_column, names):
+    """
+    Map names to ids in a name-keyed lookup table (genres, people), creating missing rows
+    Uses IN (...) queries and one batched insert rather than a query per name
+    Returns a dict of {name: id}
+    """
+    names = sorted(set(names))
+    ids = {}
+    
+    for chunk in chunked(names):
+        rows = db.session.execute(
+            db.select(id_column, model.name).where(model.name.in_(chunk)).order_by(id_column)
+        )
+        for row_id, name in rows:
+            # People are not unique by name; reuse the oldest match like filter_by().first()
+            ids.setdefault(name, row_id)
+    
+    missing = [name for name in names if name not in ids]
+    for chunk in chunked(missing):
+        rows = db.session.execute(
+            db.insert(model).returning(id_column, model.name),
+            [{'name': name} for name in chunk]
+        )
+        ids.update((name, row_id) for row_id, name in rows)
+    
+    return ids
+
+def bulk_import_movies(movies):
+    """
+    Insert parsed movie dicts with their genres, directors and cast in bulk
+    Movies and association rows are written with chunked executemany inserts, and indexed for search per batch
+    Returns the list of new movie ids, in input order
+    """
+    if not movies:
+        return []
+    
+    genre_ids = resolve_names(
+        Genre, Genre.genre_id,
+        [name for movie_data in movies for name in movie_data.get('genres', [])]
+    )
+    person_ids = resolve_names(
+        Person, Person.person_id,
+        [name for movie_data in movies
+         for name in movie_data.get('directors', []) + movie_data.get('cast', [])]
+    )
+    
+    movie_rows = []
+    for movie_data in movies:
+        row = {field: movie_data.get(field) for field in MOVIE_IMPORT_FIELDS}
+        row['watch_status'] = bool(row['watch_status'])
+        movie_rows.append(row)
+    
+    # Index the whole batch at the end instead of once per movie and association row
+    pause_search_index()
+    
+    movie_ids = []
+    for chunk in chunked(movie_rows):
+        movie_ids.extend(db.session.scalars(
+            db.insert(Movie).returning(Movie.movie_id, sort_by_parameter_order=True),
+            chunk
+        ))
+    
+    # Sets drop names repeated within a row, which would violate the composite primary keys
+    genre_rows = set()
+    people_rows = set()
+    for movie_id, movie_data in zip(movie_ids, movies):
+        for name in movie_data.get('genres', []):
+            genre_rows.add((movie_id, genre_ids[name]))
+        for name in movie_data.get('directors', []):
+            people_rows.add((movie_id, person_ids[name], 'director'))
+        for name in movie_data.get('cast', []):
+            people_rows.add((movie_id, person_ids[name], 'actor'))
+    
+    genre_params = [{'movie_id': movie_id, 'genre_id': genre_id} for movie_id, genre_id in sorted(genre_rows)]
+    for chunk in chunked(genre_params):
+        db.session.execute(db.insert(MovieGenre), chunk)
+    
+    people_params = [
+        {'movie_id': movie_id, 'person_id': person_id, 'role_type': role_type}
+        for movie_id, person_id, role_type in sorted(people_rows)
+    ]
+    for chunk in chunked(people_params):
+        db.session.execute(db.insert(MoviePerson), chunk)
+    
+    index_new_movies(movie_ids)
+    
+    # Core inserts skip the ORM events that keep the in-memory indexes current
+    queue_suggestions(db.session, 'title', [movie_data['title'] for movie_data in movies])
+    queue_library_titles(db.session, [
+        (movie_id, movie_data['title'], movie_data.get('release_year'))
+        for movie_id, movie_data in zip(movie_ids, movies)
+    ])
+    queue_suggestions(db.session, 'genre', genre_ids)
+    queue_suggestions(db.session, 'person', person_ids)
+    refresh_smart_collections(db.session.connection(), movie_ids)
+    
+    index_barcodes(
+        [entry for movie_id, movie_data in zip(movie_ids, movies)
+         for entry in movie_barcode_entries(movie_id, movie_data)],
+        'import'
+    )
+    
+    return movie_ids
+
+# Background import jobs
+# A single worker, since SQLite allows only one writer at a time
+import_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv-import')
+
+IMPORT_FINISHED_STATUSES = ('completed', 'partial', 'failed')
+
+def import_spool_path(import_id):
+    """
+    Path of the spooled upload for an import job
+    """
+    return os.path.join(app.config['IMPORT_SPOOL_DIR'], f'{import_id}.csv')
+
+def run_import_job(import_id):
+    """
+    Import a spooled CSV upload on the worker thread, committing progress after every batch
+    Batches already committed are kept if a later batch fails
+    """
+    from csv_utils import new_import_results, iter_csv_batches, finish_import_results
+    
+    with app.app_context():
+        # Claim the job atomically, so a job queued twice (e.g. by two processes resuming) runs once
+        claimed = db.session.execute(
+            db.update(ImportLog)
+            .where(ImportLog.import_id == import_id, ImportLog.status == 'queued')
+            .values(status='running', started_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        
+        if not claimed:
+            return
+        
+        import_log = db.session.get(ImportLog, import_id)
+        spool_path = import_spool_path(import_id)
+        import_results = new_import_results()
+        
+        # Counts as of the last commit; a batch that fails is rolled back and must not be reported
+        committed = {'imported': 0, 'skipped': 0, 'failed': 0}
+        
+        try:
+            # Built fresh per job, so it reflects every committed movie, including other processes' writes
+            existing_titles = build_title_index() if import_log.skip_duplicates else None
+            
+            with open(spool_path, 'rb') as spool_file:
+                for batch in iter_csv_batches(spool_file, import_results, import_log.skip_duplicates, existing_titles):
+                    bulk_import_movies(batch)
+                    
+                    import_log.records_imported = import_results['imported']
+                    import_log.records_skipped = import_results['skipped']
+                    import_log.records_failed = import_results['failed']
+                    import_log.records_total = import_results['imported'] + import_results['skipped'] + import_results['failed']
+                    import_log.bytes_processed = spool_file.tell()
+                    db.session.commit()
+                    committed = {key: import_results[key] for key in committed}
+            
+            finish_import_results(import_results)
+            committed = {key: import_results[key] for key in committed}
+            
+            if import_results['success']:
+                import_log.status = 'completed' if import_results['failed'] == 0 else 'partial'
+                errors = import_results['errors']
+            else:
+                import_log.status = 'failed'
+                errors = [import_results['message']] + import_results['errors']
+        
+        except Exception as e:
+            db.session.rollback()
+            import_log = db.session.get(ImportLog, import_id)
+            import_log.status = 'failed'
+            errors = [f'Error importing CSV: {str(e)}'] + import_results['errors']
+        
+        import_log.records_imported = committed['imported']
+        import_log.records_skipped = committed['skipped']
+        import_log.records_failed = committed['failed']
+        import_log.records_total = committed['imported'] + committed['skipped'] + committed['failed']
+        import_log.bytes_processed = import_log.bytes_total
+        import_log.error_message = '\n'.join(errors) if errors else None
+        import_log.finished_at = datetime.utcnow()
+        db.session.commit()
+        
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+
+def submit_import_job(import_id):
+    """
+    Queue an import job on the background worker
+    """
+    import_executor.submit(run_import_job, import_id)
+
+def resume_import_jobs():
+    """
+    Requeue jobs left waiting by a restart and fail jobs that were interrupted mid-run
+    """
+    for import_log in ImportLog.query.filter(ImportLog.status.in_(['queued', 'running'])).all():
+        if import_log.status == 'queued' and os.path.exists(import_spool_path(import_log.import_id)):
+            submit_import_job(import_log.import_id)
+        else:
+            import_log.status = 'failed'
+            import_log.error_message = 'Import was interrupted by a server restart'
+            import_log.finished_at = datetime.utcnow()
+    
+    db.session.commit()
+
+def import_job_status(import_log):
+    """
+    Summarize an import job for the progress endpoint and template
+    """
+    finished = import_log.status in IMPORT_FINISHED_STATUSES
+    imported = import_log.records_imported or 0
+    
+    if import_log.bytes_total:
+        progress = min(100, round(100 * (import_log.bytes_processed or 0) / import_log.bytes_total))
+    else:
+        progress = 100 if finished else 0
+    
+    if import_log.status == 'queued':
+        message = 'Waiting to start'
+    elif import_log.status == 'running':
+        message = f'Imported {imported} movies so far'
+    elif import_log.status == 'failed' and not imported:
+        message = 'No movies were imported'
+    else:
+        message = f'Successfully imported {imported} movies'
+    
+    return {
+        'import_id': import_log.import_id,
+        'filename': import_log.filename,
+        'status': import_log.status,
+        'finished': finished,
+        'success': finished and imported > 0,
+        'message': message,
+        'progress': progress,
+        'total': import_log.records_total or 0,
+        'imported': imported,
+        'skipped': import_log.records_skipped or 0,
+        'failed': import_log.records_failed or 0,
+        'errors': import_log.error_message.split('\n') if import_log.error_message else []
+    }
+
 @app.route('/import/csv', methods=['GET', 'POST'])
 def import_csv():
-    import_results = None
-    
     if request.method == 'POST':
         # Check if file was uploaded
         if 'csv_file' not in request.files:
@@ -260,110 +1314,57 @@ def import_csv():
             flash('Only CSV files are allowed', 'danger')
             return redirect(request.url)
         
-        # Process CSV file
+        # Spool the upload to disk and hand it to the background worker
         try:
-            from csv_utils import parse_csv_file, create_import_log
-            
-            # Get existing movies for duplicate checking
-            skip_duplicates = 'skip_duplicates' in request.form
-            existing_movies = Movie.query.all() if skip_duplicates else None
+            import_log = ImportLog(
+                filename=file.filename,
+                status='queued',
+                skip_duplicates='skip_duplicates' in request.form
+            )
+            db.session.add(import_log)
+            db.session.flush()
             
-            # Parse CSV file
-            import_results = parse_csv_file(file, skip_duplicates, existing_movies)
+            spool_path = import_spool_path(import_log.import_id)
+            os.makedirs(os.path.dirname(spool_path), exist_ok=True)
+            file.save(spool_path)
+            import_log.bytes_total = os.path.getsize(spool_path)
             
-            # If successful, add movies to database
-            if import_results['success'] and import_results['movies']:
-                for movie_data in import_results['movies']:
-                    # Create new movie
-                    new_movie = Movie(
-                        title=movie_data['title'],
-                        release_year=movie_data.get('release_year'),
-                        runtime_minutes=movie_data.get('runtime_minutes'),
-                        synopsis=movie_data.get('synopsis'),
-                        poster_url=movie_data.get('poster_url'),
-                        upc=movie_data.get('upc'),
-                        isbn=movie_data.get('isbn'),
-                        imdb_id=movie_data.get('imdb_id'),
-                        tmdb_id=movie_data.get('tmdb_id'),
-                        format=movie_data.get('format'),
-                        watch_status=movie_data.get('watch_status', False),
-                        personal_notes=movie_data.get('personal_notes')
-                    )
-                    
-                    db.session.add(new_movie)
-                    db.session.flush()  # Get the movie_id without committing
-                    
-                    # Add genres
-                    for genre_name in movie_data.get('genres', []):
-                        genre = Genre.query.filter_by(name=genre_name).first()
-                        if not genre:
-                            genre = Genre(name=genre_name)
-                            db.session.add(genre)
-                            db.session.flush()
-                        
-                        movie_genre = MovieGenre(movie_id=new_movie.movie_id, genre_id=genre.genre_id)
-                        db.session.add(movie_genre)
-                    
-                    # Add directors
-                    for director_name in movie_data.get('directors', []):
-                        person = Person.query.filter_by(name=director_name).first()
-                        if not person:
-                            person = Person(name=director_name)
-                            db.session.add(person)
-                            db.session.flush()
-                        
-                        movie_person = MoviePerson(
-                            movie_id=new_movie.movie_id, 
-                            person_id=person.person_id,
-                            role_type='director'
-                        )
-                        db.session.add(movie_person)
-                    
-                    # Add cast
-                    for actor_name in movie_data.get('cast', []):
-                        person = Person.query.filter_by(name=actor_name).first()
-                        if not person:
-                            person = Person(name=actor_name)
-                            db.session.add(person)
-                            db.session.flush()
-                        
-                        movie_person = MoviePerson(
-                            movie_id=new_movie.movie_id, 
-                            person_id=person.person_id,
-                            role_type='actor'
-                        )
-                        db.session.add(movie_person)
-                
-                # Create import log
-                import_log = ImportLog(
-                    filename=file.filename,
-                    status='completed' if import_results['failed'] == 0 else 'partial',
-                    records_total=import_results['total'],
-                    records_imported=import_results['imported'],
-                    error_message='\n'.join(import_results['errors']) if import_results['errors'] else None
-                )
-                db.session.add(import_log)
-                
-                # Commit changes
-                db.session.commit()
-                flash(f"Successfully imported {import_results['imported']} movies", 'success')
-            else:
-                flash(import_results['message'], 'warning')
-                
+            db.session.commit()
         except Exception as e:
             db.session.rollback()
             flash(f'Error importing CSV: {str(e)}', 'danger')
-            import_results = {
-                'success': False,
-                'message': f'Error importing CSV: {str(e)}',
-                'total': 0,
-                'imported': 0,
-                'skipped': 0,
-                'failed': 0,
-                'errors': [str(e)]
-            }
+            return redirect(request.url)
+        
+        submit_import_job(import_log.import_id)
+        
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify({
+                'success': True,
+                'import_id': import_log.import_id,
+                'status_url': url_for('api_import_status', import_id=import_log.import_id)
+            }), 202
+        
+        flash(f'Import of {file.filename} started', 'info')
+        return redirect(url_for('import_csv', import_id=import_log.import_id))
     
-    return render_template('import_csv.html', import_results=import_results)
+    import_job = None
+    import_id = request.args.get('import_id', type=int)
+    if import_id:
+        import_job = import_job_status(ImportLog.query.get_or_404(import_id))
+    
+    return render_template('import_csv.html', import_job=import_job)
+
+@app.route('/api/import/<int:import_id>')
+def api_import_status(import_id):
+    """
+    API endpoint to poll the progress of a background CSV import
+    """
+    import_log = db.session.get(ImportLog, import_id)
+    
+    if not import_log:
+        return jsonify({'success': False, 'message': 'Import not found'}), 404
+    
+    return jsonify(import_job_status(import_log))
 
 @app.route('/download/csv-template')
 def download_csv_template():
@@ -427,6 +1428,13 @@ def add_movie():
             db.session.add(new_movie)
             db.session.flush()  # Get the movie_id without committing
             
+            index_barcodes(movie_barcode_entries(new_movie.movie_id, {
+                'upc': upc,
+                'isbn': isbn,
+                'imdb_id': imdb_id,
+                'tmdb_id': tmdb_id
+            }), 'library')
+            
             # Process directors
             directors = request.form.get('director', '')
             if directors:
@@ -487,17 +1495,230 @@ def add_movie():
     # For GET requests, render the form
     return render_template('add_movie.html', current_year=datetime.now().year)
 
+# Smart collections
+# Membership is materialized in movie_collections and kept current as movies change,
+# so viewing a smart collection costs the same as viewing a hand-curated one
+def collection_rules_clause(rules):
+    """
+    Compile smart collection rules to a WHERE clause over movies
+    Criteria are ANDed, names within a criterion ORed; names match case-insensitively
+    """
+    clauses = []
+    
+    if rules.get('genres'):
+        clauses.append(
+            db.select(MovieGenre.movie_id)
+            .join(Genre, Genre.genre_id == MovieGenre.genre_id)
+            .where(MovieGenre.movie_id == Movie.movie_id, Genre.name.collate('NOCASE').in_(rules['genres']))
+            .exists()
+        )
+    if rules.get('directors'):
+        clauses.append(
+            db.select(MoviePerson.movie_id)
+            .join(Person, Person.person_id == MoviePerson.person_id)
+            .where(MoviePerson.movie_id == Movie.movie_id, MoviePerson.role_type == 'director',
+                   Person.name.collate('NOCASE').in_(rules['directors']))
+            .exists()
+        )
+    if rules.get('tags'):
+        clauses.append(
+            db.select(MovieTag.movie_id)
+            .join(Tag, Tag.tag_id == MovieTag.tag_id)
+            .where(MovieTag.movie_id == Movie.movie_id, Tag.name.collate('NOCASE').in_(rules['tags']))
+            .exists()
+        )
+    if rules.get('formats'):
+        clauses.append(Movie.format.collate('NOCASE').in_(rules['formats']))
+    if rules.get('year_min'):
+        clauses.append(Movie.release_year >= rules['year_min'])
+    if rules.get('year_max'):
+        clauses.append(Movie.release_year <= rules['year_max'])
+    if 'watch_status' in rules:
+        clauses.append(db.func.coalesce(Movie.watch_status, False) == rules['watch_status'])
+    
+    return db.and_(*clauses)
+
+def smart_collection_rules(conn):
+    """
+    Return {collection_id: rules} for every smart collection
+    """
+    rows = conn.execute(db.select(Collection.collection_id, Collection.rules).where(Collection.rules.is_not(None)))
+    return {collection_id: json.loads(rules) for collection_id, rules in rows}
+
+def refresh_smart_collections(conn, movie_ids=None, collections=None):
+    """
+    Bring smart collection membership in line with the rules, with two statements per collection
+    Only movie_ids are re-evaluated when given, which keeps edits cheap; otherwise every movie is
+    collections maps collection_id to rules and defaults to every smart collection
+    Runs on a Core connection, so it can be called while the session is flushing
+    """
+    if collections is None:
+        collections = smart_collection_rules(conn)
+    if not collections or movie_ids == []:
+        return
+    
+    members = MovieCollection.__table__
+    for collection_id, rules in collections.items():
+        matching = db.select(Movie.movie_id).where(collection_rules_clause(rules))
+        stale = db.delete(members).where(members.c.collection_id == collection_id)
+        
+        if movie_ids is not None:
+            scope = json_id_list(movie_ids)
+            matching = matching.where(Movie.movie_id.in_(scope))
+            stale = stale.where(members.c.movie_id.in_(scope))
+        
+        conn.execute(stale.where(members.c.movie_id.not_in(matching)))
+        conn.execute(
+            sqlite_insert(members).from_select(
+                ['movie_id', 'collection_id'],
+                matching.add_columns(db.literal(collection_id))
+            ).on_conflict_do_nothing()
+        )
+
+def mark_smart_collection_movie(mapper, connection, target):
+    """
+    Remember a flushed movie (or one of its genres, people or tags) for re-evaluation after the flush
+    """
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('smart_collection_movies', set()).add(target.movie_id)
+
+for model in (Movie, MovieGenre, MoviePerson, MovieTag):
+    for mapper_event in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(model, mapper_event, mark_smart_collection_movie)
+
+@event.listens_for(Session, 'after_flush_postexec')
+def update_smart_collections(session, flush_context):
+    movie_ids = session.info.pop('smart_collection_movies', None)
+    if movie_ids:
+        refresh_smart_collections(session.connection(), sorted(movie_ids))
+
+def collection_rules_from_form(form):
+    """
+    Read smart collection rules from the collection form, or None for a hand-curated collection
+    Raises InvalidRule if the rules are malformed
+    """
+    if not form.get('smart'):
+        return None
+    
+    return parse_rules({
+        'genres': form.get('rule_genres', ''),
+        'directors': form.get('rule_directors', ''),
+        'tags': form.get('rule_tags', ''),
+        'formats': form.getlist('rule_formats'),
+        'year_min': form.get('rule_year_min'),
+        'year_max': form.get('rule_year_max'),
+        'watch_status': {'watched': True, 'unwatched': False}.get(form.get('rule_watch_status')),
+    })
+
+SMART_COLLECTION_MESSAGE = 'Smart collections follow their rules; edit the rules to change which movies they hold'
+
 # Collection management routes
+def collection_summary_query():
+    """
+    Query returning (collection_id, name, description, movie_count) rows for every collection
+    Counts come from one GROUP BY over movie_collections instead of loading each collection's movies
+    """
+    counts = (
+        db.select(MovieCollection.collection_id, db.func.count().label('movie_count'))
+        .group_by(MovieCollection.collection_id)
+        .subquery('counts')
+    )
+    return (
+        db.session.query(
+            Collection.collection_id,
+            Collection.name,
+            Collection.description,
+            Collection.rules,
+            db.func.coalesce(counts.c.movie_count, 0).label('movie_count'),
+        )
+        .outerjoin(counts, counts.c.collection_id == Collection.collection_id)
+        .order_by(Collection.collection_id)
+    )
+
 @app.route('/collections')
 def collections():
-    collections = Collection.query.all()
+    collections = collection_summary_query().all()
     return render_template('collections.html', collections=collections)
 
 @app.route('/collection/<int:collection_id>')
 def collection_detail(collection_id):
     collection = Collection.query.get_or_404(collection_id)
-    all_movies = Movie.query.all()
-    return render_template('collection_detail.html', collection=collection, all_movies=all_movies)
+    
+    member_ids = db.select(MovieCollection.movie_id).where(MovieCollection.collection_id == collection_id)
+    movies = (movie_card_query()
+              .filter(Movie.movie_id.in_(member_ids))
+              .order_by(Movie.title)
+              .all())
+    
+    # Smart collections cannot be moved into by hand
+    other_collections = (db.session.query(Collection.collection_id, Collection.name)
+                         .filter(Collection.collection_id != collection_id, Collection.rules.is_(None))
+                         .order_by(Collection.name)
+                         .all())
+    
+    # Candidates for the "add movies" modal are fetched page by page from /api/collection/<id>/picker
+    rules = json.loads(collection.rules) if collection.rules else {}
+    
+    return render_template('collection_detail.html', collection=collection, movies=movies,
+                           other_collections=other_collections, rules=rules)
+
+PICKER_PAGE_SIZE = 50
+MAX_PICKER_PAGE_SIZE = 200
+
+@app.route('/api/collection/<int:collection_id>/picker')
+def api_collection_picker(collection_id):
+    """
+    API endpoint listing movies that can be added to a collection, in title order.
+    Current members are left out; q matches the full-text index by word prefix, and year and format filter exactly.
+    Pages are keyset-paginated: pass the returned next_cursor as after to continue.
+    """
+    if db.session.get(Collection, collection_id) is None:
+        return jsonify({'success': False, 'message': 'Collection not found'}), 404
+    
+    limit = min(max(request.args.get('limit', PICKER_PAGE_SIZE, type=int), 1), MAX_PICKER_PAGE_SIZE)
+    year = request.args.get('year', type=int)
+    movie_format = request.args.get('format', '').strip()
+    match = fts_match_query(request.args.get('q', ''))
+    after = decode_title_cursor(request.args.get('after'))
+    
+    sort_title = db.func.lower(Movie.title)
+    is_member = (
+        db.select(MovieCollection.movie_id)
+        .where(MovieCollection.collection_id == collection_id, MovieCollection.movie_id == Movie.movie_id)
+        .exists()
+    )
+    query = (
+        db.session.query(Movie.movie_id, Movie.title, Movie.release_year, Movie.format, sort_title.label('sort_title'))
+        .filter(~is_member)
+    )
+    
+    if match is not None:
+        hits = db.text('SELECT rowid FROM movies_fts WHERE movies_fts MATCH :match').bindparams(match=match)
+        query = query.filter(Movie.movie_id.in_(hits.columns(rowid=db.Integer)))
+    if year:
+        query = query.filter(Movie.release_year == year)
+    if movie_format:
+        query = query.filter(Movie.format == movie_format)
+    if after:
+        query = query.filter(db.tuple_(sort_title, Movie.movie_id) > db.tuple_(*after))
+    
+    rows = query.order_by(sort_title, Movie.movie_id).limit(limit + 1).all()
+    page = rows[:limit]
+    
+    return jsonify({
+        'success': True,
+        'movies': [
+            {
+                'movie_id': movie.movie_id,
+                'title': movie.title,
+                'release_year': movie.release_year,
+                'format': movie.format
+            }
+            for movie in page
+        ],
+        'next_cursor': encode_title_cursor(page[-1].sort_title, page[-1].movie_id) if len(rows) > limit else None
+    })
 
 @app.route('/collection/add', methods=['POST'])
 def add_collection():
@@ -509,8 +1730,18 @@ def add_collection():
             flash('Collection name is required', 'danger')
             return redirect(url_for('collections'))
         
-        new_collection = Collection(name=name, description=description)
+        try:
+            rules = collection_rules_from_form(request.form)
+        except InvalidRule as e:
+            flash(f'Invalid smart collection rules: {str(e)}', 'danger')
+            return redirect(url_for('collections'))
+        
+        new_collection = Collection(name=name, description=description, rules=json.dumps(rules) if rules else None)
         db.session.add(new_collection)
+        db.session.flush()
+        
+        if rules:
+            refresh_smart_collections(db.session.connection(), collections={new_collection.collection_id: rules})
         db.session.commit()
         
         flash(f'Collection "{name}" created successfully', 'success')
@@ -532,8 +1763,19 @@ def edit_collection(collection_id):
             flash('Collection name is required', 'danger')
             return redirect(url_for('collection_detail', collection_id=collection_id))
         
+        try:
+            rules = collection_rules_from_form(request.form)
+        except InvalidRule as e:
+            flash(f'Invalid smart collection rules: {str(e)}', 'danger')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
         collection.name = name
         collection.description = description
+        # A smart collection turned back into a hand-curated one keeps its current movies
+        collection.rules = json.dumps(rules) if rules else None
+        
+        if rules:
+            refresh_smart_collections(db.session.connection(), collections={collection_id: rules})
         db.session.commit()
         
         flash(f'Collection updated successfully', 'success')
@@ -557,28 +1799,105 @@ def delete_collection(collection_id):
         flash(f'Error deleting collection: {str(e)}', 'danger')
         return redirect(url_for('collection_detail', collection_id=collection_id))
 
+# Bulk collection membership
+def parse_movie_ids(values):
+    """
+    Parse posted movie ids into a list of unique ints, keeping their order
+    Values that are not ids are dropped
+    """
+    movie_ids = {}
+    for value in values:
+        try:
+            movie_ids.setdefault(int(value), None)
+        except (TypeError, ValueError):
+            continue
+    return list(movie_ids)
+
+def json_id_list(ids):
+    """
+    Select a list of ids from a single JSON parameter, usable in IN (...) and INSERT ... SELECT
+    One bound parameter regardless of list length, so no chunking is needed
+    """
+    return db.text('SELECT value FROM json_each(:ids)').bindparams(ids=json.dumps(ids)).columns(value=db.Integer)
+
+def add_collection_members(collection_id, movie_ids):
+    """
+    Add movies to a collection with set-based queries instead of a lookup per id
+    Ids are validated with one IN query and compared against one set of existing members;
+    the new memberships are written by a single INSERT ... ON CONFLICT DO NOTHING
+    Returns a dict of added, existing and unknown counts
+    """
+    requested = json_id_list(movie_ids)
+    valid = set(db.session.scalars(db.select(Movie.movie_id).where(Movie.movie_id.in_(requested))))
+    existing = set(db.session.scalars(
+        db.select(MovieCollection.movie_id)
+        .where(MovieCollection.collection_id == collection_id, MovieCollection.movie_id.in_(requested))
+    ))
+    new_ids = [movie_id for movie_id in movie_ids if movie_id in valid and movie_id not in existing]
+    
+    added = 0
+    if new_ids:
+        new_members = json_id_list(new_ids).subquery('new_members')
+        stmt = sqlite_insert(MovieCollection).from_select(
+            ['movie_id', 'collection_id'],
+            # The WHERE keeps SQLite from reading ON CONFLICT as a join constraint
+            db.select(new_members.c.value, db.literal(collection_id)).where(db.true())
+        ).on_conflict_do_nothing()
+        added = db.session.execute(stmt).rowcount
+    
+    return {
+        'added': added,
+        'existing': len(existing),
+        'unknown': len(movie_ids) - len(valid)
+    }
+
+def remove_collection_members(collection_id, movie_ids):
+    """
+    Remove movies from a collection with one DELETE
+    Returns the number of memberships removed
+    """
+    stmt = db.delete(MovieCollection).where(
+        MovieCollection.collection_id == collection_id,
+        MovieCollection.movie_id.in_(json_id_list(movie_ids))
+    )
+    return db.session.execute(stmt).rowcount
+
+def move_collection_members(source_id, target_id, movie_ids):
+    """
+    Move movies that belong to source_id into target_id in one transaction
+    Movies already in the target just leave the source
+    Returns a dict of moved and added counts (added excludes movies the target already had)
+    """
+    members = list(db.session.scalars(
+        db.select(MovieCollection.movie_id)
+        .where(MovieCollection.collection_id == source_id, MovieCollection.movie_id.in_(json_id_list(movie_ids)))
+    ))
+    if not members:
+        return {'moved': 0, 'added': 0}
+    
+    result = add_collection_members(target_id, members)
+    remove_collection_members(source_id, members)
+    return {'moved': len(members), 'added': result['added']}
+
 @app.route('/collection/<int:collection_id>/add-movies', methods=['POST'])
 def add_to_collection(collection_id):
     try:
         collection = Collection.query.get_or_404(collection_id)
-        movie_ids = request.form.getlist('movie_ids')
+        movie_ids = parse_movie_ids(request.form.getlist('movie_ids'))
+        
+        if collection.rules:
+            flash(SMART_COLLECTION_MESSAGE, 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
         
         if not movie_ids:
             flash('No movies selected', 'warning')
             return redirect(url_for('collection_detail', collection_id=collection_id))
         
-        added_count = 0
-        for movie_id in movie_ids:
-            movie = Movie.query.get(movie_id)
-            if movie and movie not in collection.movies:
-                movie_collection = MovieCollection(movie_id=movie_id, collection_id=collection_id)
-                db.session.add(movie_collection)
-                added_count += 1
-        
+        result = add_collection_members(collection_id, movie_ids)
         db.session.commit()
         
-        if added_count > 0:
-            flash(f'Added {added_count} movies to collection', 'success')
+        if result['added'] > 0:
+            flash(f'Added {result["added"]} movies to collection', 'success')
         else:
             flash('No new movies added to collection', 'info')
         
@@ -596,6 +1915,10 @@ def remove_from_collection(collection_id, movie_id):
             collection_id=collection_id
         ).first_or_404()
         
+        if Collection.query.get_or_404(collection_id).rules:
+            flash(SMART_COLLECTION_MESSAGE, 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
         db.session.delete(movie_collection)
         db.session.commit()
         
@@ -606,6 +1929,142 @@ def remove_from_collection(collection_id, movie_id):
         flash(f'Error removing movie from collection: {str(e)}', 'danger')
         return redirect(url_for('collection_detail', collection_id=collection_id))
 
+@app.route('/collection/<int:collection_id>/remove-movies', methods=['POST'])
+def remove_many_from_collection(collection_id):
+    try:
+        collection = Collection.query.get_or_404(collection_id)
+        movie_ids = parse_movie_ids(request.form.getlist('movie_ids'))
+        
+        if collection.rules:
+            flash(SMART_COLLECTION_MESSAGE, 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
+        if not movie_ids:
+            flash('No movies selected', 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
+        removed_count = remove_collection_members(collection_id, movie_ids)
+        db.session.commit()
+        
+        flash(f'Removed {removed_count} movies from collection', 'success')
+        return redirect(url_for('collection_detail', collection_id=collection_id))
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error removing movies from collection: {str(e)}', 'danger')
+        return redirect(url_for('collection_detail', collection_id=collection_id))
+
+@app.route('/collection/<int:collection_id>/move-movies', methods=['POST'])
+def move_collection_movies(collection_id):
+    try:
+        collection = Collection.query.get_or_404(collection_id)
+        target = db.session.get(Collection, request.form.get('target_collection_id', type=int) or 0)
+        movie_ids = parse_movie_ids(request.form.getlist('movie_ids'))
+        
+        if collection.rules or (target is not None and target.rules):
+            flash(SMART_COLLECTION_MESSAGE, 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
+        if target is None or target.collection_id == collection_id:
+            flash('Choose another collection to move the movies to', 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
+        if not movie_ids:
+            flash('No movies selected', 'warning')
+            return redirect(url_for('collection_detail', collection_id=collection_id))
+        
+        result = move_collection_members(collection_id, target.collection_id, movie_ids)
+        db.session.commit()
+        
+        flash(f'Moved {result["moved"]} movies to "{target.name}"', 'success')
+        return redirect(url_for('collection_detail', collection_id=collection_id))
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error moving movies: {str(e)}', 'danger')
+        return redirect(url_for('collection_detail', collection_id=collection_id))
+
+@app.route('/api/collection/<int:collection_id>/members', methods=['POST'])
+def api_collection_members(collection_id):
+    """
+    API endpoint to change a collection's membership in bulk.
+    Expects JSON {"action": "add" | "remove" | "move", "movie_ids": [...]}, plus "target_collection_id" for move.
+    Every action is a fixed number of set-based queries, however many ids are sent.
+    """
+    collection = db.session.get(Collection, collection_id)
+    if collection is None:
+        return jsonify({'success': False, 'message': 'Collection not found'}), 404
+    
+    if collection.rules:
+        return jsonify({'success': False, 'message': SMART_COLLECTION_MESSAGE}), 400
+    
+    payload = request.get_json(silent=True)
+    payload = payload if isinstance(payload, dict) else {}
+    action = payload.get('action')
+    raw_ids = payload.get('movie_ids')
+    
+    if action not in ('add', 'remove', 'move'):
+        return jsonify({'success': False, 'message': 'action must be add, remove or move'}), 400
+    
+    if not isinstance(raw_ids, list):
+        return jsonify({'success': False, 'message': 'Expected a list of movie_ids'}), 400
+    
+    movie_ids = parse_movie_ids(raw_ids)
+    
+    try:
+        if action == 'add':
+            result = add_collection_members(collection_id, movie_ids)
+        elif action == 'remove':
+            result = {'removed': remove_collection_members(collection_id, movie_ids)}
+        else:
+            target_id = payload.get('target_collection_id')
+            target = db.session.get(Collection, target_id) if isinstance(target_id, int) else None
+            if target is None or target_id == collection_id or target.rules:
+                return jsonify({'success': False, 'message': 'Invalid target_collection_id'}), 400
+            result = move_collection_members(collection_id, target_id, movie_ids)
+        
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'message': f'Error updating collection: {str(e)}'}), 500
+    
+    return jsonify({'success': True, 'action': action, **result})
+
+def ensure_indexes():
+    """
+    Create any indexes declared on the models that are missing from an existing database
+    Existing names come from sqlite_master, since reflection skips expression indexes
+    """
+    with db.engine.connect() as conn:
+        existing = set(conn.execute(db.text("SELECT name FROM sqlite_master WHERE type = 'index'")).scalars())
+    
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(db.engine)
+
+def ensure_columns():
+    """
+    Add columns declared on the models that are missing from existing tables
+    Only nullable columns are added, so existing rows stay valid
+    """
+    inspector = db.inspect(db.engine)
+    
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable:
+                    column_type = column.type.compile(dialect=db.engine.dialect)
+                    conn.execute(db.text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+
+def upgrade_schema():
+    """
+    Bring an existing database up to date with the models without dropping any data
+    """
+    db.create_all()
+    ensure_columns()
+    ensure_indexes()
+    backfill_barcodes()
+
 # Initialize the database
 @app.cli.command('init-db')
 def init_db_command():
@@ -614,6 +2073,12 @@ def init_db_command():
     db.create_all()
     print('Initialized the database.')
 
+@app.cli.command('upgrade-db')
+def upgrade_db_command():
+    """Add missing tables, columns and indexes without touching existing data."""
+    upgrade_schema()
+    print('Upgraded the database.')
+
 # Create context processor for template globals
 @app.context_processor
 def utility_processor():
@@ -621,7 +2086,9 @@ def utility_processor():
         if date:
             return date.strftime('%Y-%m-%d')
         return ''
-    return dict(format_date=format_date)
+    def describe_collection_rules(rules):
+        return describe_rules(json.loads(rules)) if rules else []
+    return dict(format_date=format_date, describe_collection_rules=describe_collection_rules)
 
 # Error handlers
 @app.errorhandler(404)
@@ -649,16 +2116,18 @@ def api_search_by_identifier(identifier_type, identifier_value):
         return jsonify({'success': False, 'message': 'Missing identifier'})
     
     # Validate identifier type
-    valid_types = ['upc', 'isbn', 'imdb_id', 'tmdb_id']
-    if identifier_type not in valid_types:
+    if identifier_type not in IDENTIFIER_TYPES:
         return jsonify({'success': False, 'message': 'Invalid identifier type'})
     
+    # Reject misreads and typos before they cost a provider round-trip
     try:
-        # Import search utilities
-        from search_utils import search_by_identifier
-        
-        # Search for movie by identifier
-        movie = search_by_identifier(identifier_type, identifier_value)
+        identifier_value = normalize_identifier(identifier_type, identifier_value, request.args.get('format'))
+    except InvalidIdentifier as e:
+        return jsonify({'success': False, 'invalid': True, 'message': f'Invalid {identifier_type}: {str(e)}'})
+    
+    try:
+        # Search the local barcode index first, then the providers
+        movie = find_movie_by_identifier(identifier_type, identifier_value)
         
         if movie:
             return jsonify({
@@ -670,7 +2139,16 @@ def api_search_by_identifier(identifier_type, identifier_value):
                 'success': False,
                 'message': f'No movie found with {identifier_type}: {identifier_value}'
             })
-            
+    
+    except ProviderError as e:
+        # Not a miss: the client should keep the identifier and try again later
+        print(f"API search error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'unavailable': True,
+            'message': PROVIDERS_UNAVAILABLE_MESSAGE
+        })
+    
     except Exception as e:
         print(f"API search error: {str(e)}")
         return jsonify({
@@ -678,7 +2156,133 @@ def api_search_by_identifier(identifier_type, identifier_value):
             'message': f'Error searching for movie: {str(e)}'
         })
 
+# Batch lookups for bulk scanning sessions
+BATCH_LOOKUP_LIMIT = 500
+BATCH_LOOKUP_WORKERS = 8
+
+# Shared by all batch requests, so concurrent sessions cannot flood the providers
+lookup_executor = ThreadPoolExecutor(max_workers=BATCH_LOOKUP_WORKERS, thread_name_prefix='identifier-lookup')
+
+def batch_lookup_line(index, identifier_type, identifier_value, movie=None, message=None, invalid=False,
+                      unavailable=False):
+    """
+    Format one NDJSON line of a batch lookup response
+    unavailable marks lookups the providers could not answer, which are worth retrying
+    """
+    line = {
+        'index': index,
+        'identifier_type': identifier_type,
+        'identifier_value': identifier_value,
+        'success': movie is not None
+    }
+    
+    if movie is not None:
+        line['movie'] = movie
+    else:
+        line['message'] = message or f'No movie found with {identifier_type}: {identifier_value}'
+    
+    if invalid:
+        line['invalid'] = True
+    
+    if unavailable:
+        line['unavailable'] = True
+    
+    return json.dumps(line) + '\n'
+
+@app.route('/api/search/batch', methods=['POST'])
+def api_search_batch():
+    """
+    API endpoint to look up many identifiers in one request.
+    Expects JSON {"items": [{"type": "upc", "value": "...", "format": "EAN_13"}, ...]}.
+    Streams one NDJSON line per item as it resolves, tagged with the item's index:
+    invalid items first, then local index hits, then provider lookups as they complete.
+    """
+    payload = request.get_json(silent=True)
+    items = payload.get('items') if isinstance(payload, dict) else None
+    
+    if not isinstance(items, list) or not items:
+        return jsonify({'success': False, 'message': 'Expected a JSON object with a list of items'}), 400
+    
+    if len(items) > BATCH_LOOKUP_LIMIT:
+        return jsonify({
+            'success': False,
+            'message': f'At most {BATCH_LOOKUP_LIMIT} identifiers can be looked up at once'
+        }), 400
+    
+    def generate():
+        from search_utils import search_by_identifier
+        
+        # Normalize every item; duplicates share one lookup
+        pending = {}
+        for index, item in enumerate(items):
+            item = item if isinstance(item, dict) else {}
+            identifier_type = item.get('type')
+            identifier_value = str(item.get('value') or '')
+            
+            if identifier_type not in IDENTIFIER_TYPES:
+                yield batch_lookup_line(index, identifier_type, identifier_value,
+                                        message='Invalid identifier type', invalid=True)
+                continue
+            
+            try:
+                identifier_value = normalize_identifier(identifier_type, identifier_value, item.get('format'))
+            except InvalidIdentifier as e:
+                yield batch_lookup_line(index, identifier_type, identifier_value,
+                                        message=f'Invalid {identifier_type}: {str(e)}', invalid=True)
+                continue
+            
+            pending.setdefault((identifier_type, identifier_value), []).append(index)
+        
+        # Answer what we can from the local barcode index in one pass
+        local = resolve_barcodes([value for identifier_type, value in pending if identifier_type in BARCODE_TYPES])
+        for (identifier_type, identifier_value), indexes in list(pending.items()):
+            if identifier_type in BARCODE_TYPES and identifier_value in local:
+                for index in indexes:
+                    yield batch_lookup_line(index, identifier_type, identifier_value, local[identifier_value])
+                del pending[(identifier_type, identifier_value)]
+        
+        # Everything else goes to the providers (through the cache) on the worker pool;
+        # the database is only touched here on the request thread
+        futures = {lookup_executor.submit(search_by_identifier, *key): key for key in pending}
+        
+        try:
+            for future in as_completed(futures):
+                identifier_type, identifier_value = key = futures[future]
+                movie = None
+                message = None
+                unavailable = False
+                
+                try:
+                    movie = future.result()
+                except ProviderError as e:
+                    print(f"Batch search error: {str(e)}")
+                    message = PROVIDERS_UNAVAILABLE_MESSAGE
+                    unavailable = True
+                except Exception as e:
+                    print(f"Batch search error: {str(e)}")
+                    message = f'Error searching for movie: {str(e)}'
+                
+                if movie and identifier_type in BARCODE_TYPES:
+                    movie = remember_barcode_result(identifier_type, identifier_value, movie)
+                    db.session.commit()
+                
+                for index in pending[key]:
+                    yield batch_lookup_line(index, identifier_type, identifier_value, movie, message,
+                                            unavailable=unavailable)
+        finally:
+            # Drop queued lookups if the client went away
+            for future in futures:
+                future.cancel()
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
+    # The debug reloader runs this block in a watcher process and again in the serving child;
+    # only the child (WERKZEUG_RUN_MAIN set) serves requests, so only it resumes import jobs
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        with app.app_context():
+            upgrade_schema()
+            resume_import_jobs()
+            get_suggest_index()
+            get_title_index()
     app.run(debug=True, host='0.0.0.0')
@@ -0,0 +1,229 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Cache database lives next to the app database unless overridden
+CACHE_PATH = os.environ.get(
+    'PROVIDER_CACHE_PATH',
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), 'provider_cache.sqlite3')
+)
+
+# Freshness windows in seconds
+CACHE_TTL = 7 * 24 * 3600            # found results are fresh for a week
+NEGATIVE_CACHE_TTL = 6 * 3600        # "not found" answers are retried sooner
+STALE_TTL = 30 * 24 * 3600           # expired entries may still be served while refreshing
+
+# LRU size limit and how often (in writes) it is enforced
+CACHE_MAX_ENTRIES = 50000
+EVICT_EVERY = 200
+
+# Last-access times are only rewritten when older than this, keeping reads write-free
+ACCESS_RESOLUTION = 300
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into a single in-flight call
+    The first caller runs the function; callers arriving meanwhile wait and share its outcome
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+    
+    def do(self, key, fn):
+        """
+        Run fn() for key unless a call for key is already in flight, then return its result
+        Exceptions raised by fn() are re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+        
+        if not leader:
+            return call.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+class ProviderCache:
+    """
+    Persistent TTL cache for provider lookups backed by a local SQLite file
+    Values are stored as JSON; empty values (None, []) are negative results with a shorter TTL
+    """
+    
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, negative_ttl=NEGATIVE_CACHE_TTL,
+                 stale_ttl=STALE_TTL, max_entries=CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+    
+    def _connection(self):
+        """
+        Return this thread's connection, creating the schema on first use
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS provider_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    stale_until REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_provider_cache_last_access ON provider_cache (last_access)')
+            self._local.conn = conn
+        return conn
+    
+    def get(self, key):
+        """
+        Look up a key
+        Returns a tuple of (hit, value, is_stale); expired entries past the stale window are misses
+        """
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT value, expires_at, stale_until, last_access FROM provider_cache WHERE cache_key = ?',
+            (key,)
+        ).fetchone()
+        
+        if row is None or row[2] < now:
+            return False, None, False
+        
+        value, expires_at, _, last_access = row
+        
+        if now - last_access > ACCESS_RESOLUTION:
+            conn.execute('UPDATE provider_cache SET last_access = ? WHERE cache_key = ?', (now, key))
+        
+        return True, json.loads(value), expires_at < now
+    
+    def set(self, key, value):
+        """
+        Store a value; empty values are cached as negative results with the shorter TTL
+        """
+        now = time.time()
+        ttl = self.ttl if value else self.negative_ttl
+        encoded = json.dumps(value)
+        
+        self._connection().execute(
+            'INSERT OR REPLACE INTO provider_cache (cache_key, value, expires_at, stale_until, last_access) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (key, encoded, now + ttl, now + ttl + self.stale_ttl, now)
+        )
+        
+        with self._writes_lock:
+            self._writes += 1
+            evict = self._writes % EVICT_EVERY == 0
+        
+        if evict:
+            self.evict()
+    
+    def evict(self):
+        """
+        Drop entries past their stale window, then the least recently used beyond max_entries
+        """
+        conn = self._connection()
+        conn.execute('DELETE FROM provider_cache WHERE stale_until < ?', (time.time(),))
+        conn.execute(
+            'DELETE FROM provider_cache WHERE cache_key IN ('
+            'SELECT cache_key FROM provider_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        )
+    
+    def refresh_in_background(self, key, fetch):
+        """
+        Re-fetch a stale key on a background thread, at most one refresh per key at a time
+        """
+        with self._refreshing_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                self.fetch_and_store(key, fetch)
+            except Exception as e:
+                # Keep serving the stale value; the next read will try again
+                print(f"Error refreshing cache entry {key}: {e}")
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(key)
+        
+        self._refresh_pool.submit(refresh)
+    
+    def fetch_and_store(self, key, fetch):
+        """
+        Call fetch() and cache its result, coalescing concurrent fetches of the same key
+        """
+        def fetch_once():
+            value = fetch()
+            self.set(key, value)
+            return value
+        
+        return self._flight.do(key, fetch_once)
+    
+    def lookup(self, key, fetch):
+        """
+        Return the cached value for key, calling fetch() and storing its result on a miss
+        Concurrent misses for the same key share one upstream call
+        Stale entries are returned immediately while a background refresh runs
+        Exceptions from fetch() propagate and are never cached
+        """
+        hit, value, is_stale = self.get(key)
+        
+        if hit:
+            if is_stale:
+                self.refresh_in_background(key, fetch)
+            return value
+        
+        return self.fetch_and_store(key, fetch)
+
+def make_cache_key(*parts):
+    """
+    Build a normalized cache key: parts are lowercased, trimmed and whitespace-collapsed
+    """
+    return ':'.join(' '.join(str(part).lower().split()) for part in parts)
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_provider_cache():
+    """
+    Return the process-wide provider cache, creating it on first use
+    """
+    global _cache
+    
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ProviderCache()
+    
+    return _cache
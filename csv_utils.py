@@ -2,74 +2,122 @@ import csv
 import io
 import json
 from datetime import datetime
+from fuzzy_utils import TitleIndex
 
-def parse_csv_file(file_stream, skip_duplicates=True, existing_movies=None):
+# Rows handed to the database writer at a time
+CSV_BATCH_SIZE = 1000
+
+# Row errors kept for reporting; further failures are only counted
+MAX_REPORTED_ERRORS = 100
+
+def new_import_results():
     """
-    Parse a CSV file containing movie data
-    Returns a tuple of (success, results)
+    Create an empty import results dictionary
     """
-    results = {
+    return {
         'success': False,
         'message': '',
         'total': 0,
         'imported': 0,
         'skipped': 0,
         'failed': 0,
-        'errors': [],
-        'movies': []
+        'errors': []
     }
+
+def finish_import_results(results):
+    """
+    Fill in the total, success flag and message once all rows have been consumed
+    """
+    results['total'] = results['imported'] + results['skipped'] + results['failed']
+    
+    if results['imported'] > 0:
+        results['success'] = True
+        results['message'] = f"Successfully imported {results['imported']} movies"
+    elif not results['message']:
+        results['message'] = "No movies were imported"
+    
+    return results
+
+def iter_csv_batches(file_stream, results, skip_duplicates=True, existing_titles=None, batch_size=CSV_BATCH_SIZE):
+    """
+    Stream parsed movie dicts from a CSV upload in lists of at most batch_size
+    The upload is decoded incrementally, so memory is bounded by the batch size, not the file size
+    existing_titles is a fuzzy TitleIndex of the movies already in the library; it is only read
+    Rows repeating a movie earlier in the same file are also skipped as duplicates, matching
+    titles fuzzily so editions and minor spelling differences count as the same movie
+    Counters and row errors are accumulated into results as rows are consumed
+    """
+    # Werkzeug uploads wrap the real file object
+    binary_stream = getattr(file_stream, 'stream', file_stream)
+    text_stream = io.TextIOWrapper(binary_stream, encoding='utf-8-sig', newline='')
     
     try:
-        # Read CSV file
-        csv_data = file_stream.read().decode('utf-8')
-        csv_reader = csv.DictReader(io.StringIO(csv_data))
-        
-        # Get field names
-        field_names = csv_reader.fieldnames
+        csv_reader = csv.DictReader(text_stream)
         
         # Check required fields
-        if 'title' not in field_names:
+        if not csv_reader.fieldnames or 'title' not in csv_reader.fieldnames:
             results['message'] = 'CSV file must contain a "title" column'
-            return results
+            return
+        
+        # Movies accepted from this file so far
+        file_titles = TitleIndex()
+        batch = []
         
         # Process rows
         for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 to account for header row
             try:
                 # Skip empty rows
-                if not row['title'].strip():
+                if not (row['title'] or '').strip():
                     continue
                 
                 # Process row data
                 movie_data = process_csv_row(row)
                 
                 # Check for duplicates if requested
-                if skip_duplicates and existing_movies:
-                    is_duplicate = False
-                    for existing_movie in existing_movies:
-                        if (existing_movie.title.lower() == movie_data['title'].lower() and
-                            existing_movie.release_year == movie_data.get('release_year')):
-                            is_duplicate = True
-                            results['skipped'] += 1
-                            break
+                if skip_duplicates:
+                    title = movie_data['title']
+                    release_year = movie_data.get('release_year')
                     
-                    if is_duplicate:
+                    if file_titles.find_duplicate(title, release_year, require_years=True) or (
+                            existing_titles is not None
+                            and existing_titles.find_duplicate(title, release_year, require_years=True)):
+                        results['skipped'] += 1
                         continue
+                    
+                    file_titles.add(title, release_year)
                 
-                # Add movie to results
-                results['movies'].append(movie_data)
+                batch.append(movie_data)
                 results['imported'] += 1
                 
             except Exception as e:
                 results['failed'] += 1
-                results['errors'].append(f"Row {row_num}: {str(e)}")
+                if len(results['errors']) < MAX_REPORTED_ERRORS:
+                    results['errors'].append(f"Row {row_num}: {str(e)}")
+            
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
         
-        results['total'] = results['imported'] + results['skipped'] + results['failed']
+        if batch:
+            yield batch
+    finally:
+        # Leave the underlying upload open for the caller
+        text_stream.detach()
+
+def parse_csv_file(file_stream, skip_duplicates=True, existing_titles=None):
+    """
+    Parse a whole CSV file containing movie data into memory
+    Prefer iter_csv_batches for large files
+    Returns a results dictionary with the parsed rows under 'movies'
+    """
+    results = new_import_results()
+    results['movies'] = []
+    
+    try:
+        for batch in iter_csv_batches(file_stream, results, skip_duplicates, existing_titles):
+            results['movies'].extend(batch)
         
-        if results['imported'] > 0:
-            results['success'] = True
-            results['message'] = f"Successfully imported {results['imported']} movies"
-        else:
-            results['message'] = "No movies were imported"
+        finish_import_results(results)
         
     except Exception as e:
         results['success'] = False
@@ -0,0 +1,211 @@
+import re
+import math
+import threading
+import unicodedata
+from collections import defaultdict
+
+# Leading (or trailing ", The") articles ignored when comparing titles
+ARTICLES = ('the', 'a', 'an')
+
+# Words marking a trailing qualifier as an edition or format rather than part of the title
+EDITION_WORDS = {
+    'edition', 'cut', 'version', 'remastered', 'remaster', 'restored', 'uncut', 'unrated', 'extended',
+    'collectors', 'anniversary', 'special', 'theatrical', 'directors', 'criterion', 'definitive',
+    'ultimate', 'limited', 'deluxe', 'bluray', 'blu', 'dvd', '4k', 'uhd', 'hd', 'widescreen',
+    'fullscreen', 'steelbook', 'imax', '3d',
+}
+
+# Edition suffixes recognised even without brackets or a separator, e.g. "Alien Director's Cut"
+EDITION_SUFFIXES = (
+    ('directors', 'cut'), ('extended', 'cut'), ('theatrical', 'cut'), ('unrated', 'cut'),
+    ('special', 'edition'), ('extended', 'edition'), ('collectors', 'edition'),
+    ('anniversary', 'edition'), ('ultimate', 'edition'), ('limited', 'edition'),
+    ('blu', 'ray'), ('remastered',), ('unrated',), ('uncut',), ('4k',), ('dvd',),
+)
+
+# A trailing "(...)", "[...]", " - ..." or ": ..." qualifier
+QUALIFIER_PATTERN = re.compile(
+    r'\s*(?:[(\[](?P<bracketed>[^()\[\]]*)[)\]]|\s[-–—]\s*(?P<dashed>[^-–—()\[\]]*)'
+    r'|:\s*(?P<colon>[^:()\[\]]*))\s*$'
+)
+
+ROMAN_NUMERALS = {'i', 'ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x'}
+
+# Similarity (Dice coefficient over trigrams) above which two titles are the same movie
+DUPLICATE_THRESHOLD = 0.8
+
+# Similarity above which a title is offered as a search candidate
+CANDIDATE_THRESHOLD = 0.4
+
+def is_edition_qualifier(text, bracketed=False):
+    """
+    Check whether a trailing qualifier names an edition, format or release year
+    Only a bracketed year counts, so "Blade Runner (1982)" loses it but "Blade Runner: 2049" keeps it
+    """
+    words = re.findall(r'\w+', text)
+    if len(words) == 1 and re.fullmatch(r'(19|20)\d\d', words[0]):
+        return bracketed
+    return any(word in EDITION_WORDS for word in words)
+
+def normalize_title(title):
+    """
+    Normalize a title for fuzzy matching
+    Accents, case, punctuation, articles and trailing edition/format qualifiers are dropped,
+    so "Alien (Director's Cut)" and "alien" both become "alien"
+    """
+    decomposed = unicodedata.normalize('NFKD', title or '')
+    text = ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    text = text.replace('&', ' and ')
+    text = re.sub(r"['’]", '', text)
+    
+    # "Matrix, The" -> "matrix"
+    text = re.sub(r',\s*(?:the|an|a)\s*$', '', text)
+    
+    # Peel qualifiers off the end while they describe the edition, not the film
+    while True:
+        match = QUALIFIER_PATTERN.search(text)
+        if not match:
+            break
+        qualifier = match.group('bracketed') or match.group('dashed') or match.group('colon') or ''
+        if not is_edition_qualifier(qualifier, bracketed=match.group('bracketed') is not None):
+            break
+        text = text[:match.start()]
+    
+    words = re.findall(r'\w+', text)
+    
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in EDITION_SUFFIXES:
+            if len(words) > len(suffix) and tuple(words[-len(suffix):]) == suffix:
+                words = words[:-len(suffix)]
+                stripped = True
+    
+    if len(words) > 1 and words[0] in ARTICLES:
+        words = words[1:]
+    
+    return ' '.join(words)
+
+def title_trigrams(key):
+    """
+    Return the set of character trigrams of a normalized title, padded so word edges count
+    """
+    padded = f'  {key} '
+    return {padded[position:position + 3] for position in range(len(padded) - 2)}
+
+def sequel_markers(key):
+    """
+    Numbers and roman numerals in a normalized title; "Rocky II" and "Rocky III" are different movies
+    """
+    return {word for word in key.split() if word.isdigit() or word in ROMAN_NUMERALS}
+
+def years_compatible(year, other_year):
+    """
+    Release years match if either is unknown or they differ by at most a year (regional releases)
+    """
+    return year is None or other_year is None or abs(year - other_year) <= 1
+
+class TitleIndex:
+    """
+    Trigram index over normalized titles for fuzzy matching
+    Lookups only read the posting lists of the query's rarest trigrams and skip titles whose length
+    alone rules out a match, so common trigrams ("the", " a ") never make a lookup scan the library
+    Each title carries a payload, e.g. a movie_id, returned with its matches
+    """
+    
+    def __init__(self):
+        self._titles = []
+        self._postings = defaultdict(list)
+        self._exact = defaultdict(list)
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._titles)
+    
+    def add(self, title, release_year=None, payload=None):
+        """
+        Add a title to the index
+        """
+        key = normalize_title(title) or (title or '').strip().casefold()
+        trigrams = frozenset(title_trigrams(key))
+        
+        with self._lock:
+            entry_id = len(self._titles)
+            self._titles.append((key, trigrams, release_year, title, payload))
+            self._exact[key].append(entry_id)
+            for trigram in trigrams:
+                self._postings[trigram].append(entry_id)
+    
+    def candidates(self, title, release_year=None, threshold=CANDIDATE_THRESHOLD, limit=10):
+        """
+        Return up to limit (score, title, release_year, payload) matches, best first
+        score is the Dice coefficient of the normalized titles' trigram sets; exact matches score 1.0
+        Titles with an incompatible release year are left out when both years are known
+        """
+        key = normalize_title(title) or (title or '').strip().casefold()
+        trigrams = title_trigrams(key)
+        size = len(trigrams)
+        
+        # Dice >= threshold bounds a match's trigram count, and the trigrams it must share with the query
+        min_size = threshold / (2 - threshold) * size
+        max_size = (2 - threshold) / threshold * size
+        min_shared = math.ceil(threshold * size / (2 - threshold) - 1e-9)
+        
+        with self._lock:
+            # Prefix filter: a title sharing min_shared trigrams shares one of the rarest
+            # size - min_shared + 1, so the long posting lists of common trigrams are never read
+            by_frequency = sorted(trigrams, key=lambda trigram: len(self._postings.get(trigram, ())))
+            probes = by_frequency[:size - min_shared + 1]
+            
+            seen = set()
+            matches = []
+            for trigram in probes:
+                for entry_id in self._postings.get(trigram, ()):
+                    if entry_id in seen:
+                        continue
+                    seen.add(entry_id)
+                    
+                    entry_key, entry_trigrams, entry_year, entry_title, payload = self._titles[entry_id]
+                    if not min_size <= len(entry_trigrams) <= max_size:
+                        continue
+                    
+                    score = 2 * len(trigrams & entry_trigrams) / (size + len(entry_trigrams))
+                    if entry_key == key:
+                        score = 1.0
+                    if score >= threshold and years_compatible(release_year, entry_year):
+                        matches.append((score, entry_title, entry_year, payload))
+        
+        matches.sort(key=lambda match: match[0], reverse=True)
+        return matches[:limit]
+    
+    def find_duplicate(self, title, release_year=None, threshold=DUPLICATE_THRESHOLD, require_years=False):
+        """
+        Return the best (score, title, release_year, payload) match that is the same movie, or None
+        Near matches must also agree on sequel numbers, so "Rocky II" never duplicates "Rocky III"
+        With require_years, a missing year only matches the exact normalized title with no year either,
+        so skipping duplicates never drops a different film that happens to share a title
+        """
+        key = normalize_title(title) or (title or '').strip().casefold()
+        
+        # Exact normalized matches need no trigram scoring
+        with self._lock:
+            for entry_id in self._exact.get(key, ()):
+                entry_key, _, entry_year, entry_title, payload = self._titles[entry_id]
+                if require_years and (release_year is None or entry_year is None):
+                    same_release = release_year == entry_year
+                else:
+                    same_release = years_compatible(release_year, entry_year)
+                if same_release:
+                    return (1.0, entry_title, entry_year, payload)
+        
+        if require_years and release_year is None:
+            return None
+        
+        markers = sequel_markers(key)
+        for match in self.candidates(title, release_year, threshold, limit=5):
+            if require_years and match[2] is None:
+                continue
+            if sequel_markers(normalize_title(match[1])) == markers:
+                return match
+        
+        return None
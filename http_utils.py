@@ -0,0 +1,150 @@
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from limiter_utils import get_rate_limiter, get_circuit_breaker
+
+# Connect and read timeouts (seconds) applied to every provider call
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+
+# Keep-alive connection pool size per provider host
+POOL_SIZES = {
+    'https://api.themoviedb.org/': 20,
+    'http://www.omdbapi.com/': 10,
+}
+DEFAULT_POOL_SIZE = 10
+
+# Provider names used for rate limits and circuit breakers
+PROVIDER_NAMES = {
+    'https://api.themoviedb.org/': 'tmdb',
+    'http://www.omdbapi.com/': 'omdb',
+}
+
+# Retry idempotent GETs on connection errors and throttling/server errors
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# A Retry-After longer than this (seconds) fails the call instead of blocking the caller
+RETRY_MAX_WAIT = 4
+
+_session = None
+_session_lock = threading.Lock()
+
+class ProviderError(Exception):
+    """
+    Raised when a provider cannot be reached or answers with an error status
+    A definite "not found" is not an error, so callers can tell misses from outages
+    """
+
+class ProviderUnavailable(ProviderError):
+    """
+    Raised without calling a provider while its circuit breaker is open
+    """
+
+class ProviderThrottled(ProviderError):
+    """
+    Raised without calling a provider when its rate limit leaves no token in time
+    """
+
+def provider_for_url(url):
+    """
+    Return the provider name for a URL, falling back to its host
+    """
+    for prefix, name in PROVIDER_NAMES.items():
+        if url.startswith(prefix):
+            return name
+    return urlsplit(url).netloc
+
+def retry_delay(attempt, response=None):
+    """
+    Seconds to wait before retry number attempt (0-based): exponential backoff, or the
+    response's Retry-After in seconds when it gives one
+    """
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.strip().isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF_FACTOR * (2 ** attempt)
+
+def build_session():
+    """
+    Create a requests session with a sized connection pool per provider host
+    Adapters never retry on their own: provider_get retries, so every attempt is rate limited
+    and reported to the circuit breaker
+    """
+    session = requests.Session()
+    session.headers['User-Agent'] = 'movie-collection-scanner'
+    
+    # Catch-all adapters for hosts without a dedicated pool
+    for prefix in ('http://', 'https://'):
+        session.mount(prefix, HTTPAdapter(pool_maxsize=DEFAULT_POOL_SIZE, max_retries=0))
+    
+    # Longer prefixes win, so each provider host gets its own pool
+    for prefix, pool_size in POOL_SIZES.items():
+        session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0))
+    
+    return session
+
+def get_session():
+    """
+    Return the process-wide provider session, creating it on first use
+    The underlying urllib3 pools are thread-safe, so all request threads share it
+    """
+    global _session
+    
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    
+    return _session
+
+def provider_get(url, params=None, timeout=None):
+    """
+    Send a GET request to a provider through the shared keep-alive session
+    Connection errors, throttling and server errors are retried with backoff; every attempt takes
+    a rate limit token and reports to the circuit breaker, which can stop the retries early
+    Raises ProviderError on connection failures, timeouts and error statuses other than 404
+    """
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    
+    provider = provider_for_url(url)
+    breaker = get_circuit_breaker()
+    
+    for attempt in range(RETRY_TOTAL + 1):
+        if not breaker.allow(provider):
+            raise ProviderUnavailable(f"{provider} is failing, skipping calls until it recovers")
+        
+        if not get_rate_limiter().acquire(provider):
+            raise ProviderThrottled(f"{provider} rate limit exceeded")
+        
+        try:
+            response = get_session().get(url, params=params, timeout=timeout)
+        except requests.RequestException as e:
+            breaker.record_failure(provider)
+            if attempt == RETRY_TOTAL:
+                raise ProviderError(str(e)) from e
+            time.sleep(retry_delay(attempt))
+            continue
+        
+        # Throttling and server errors count against the provider; client errors are ours
+        if response.status_code not in RETRY_STATUS_CODES:
+            breaker.record_success(provider)
+            break
+        
+        breaker.record_failure(provider)
+        if attempt == RETRY_TOTAL:
+            break
+        
+        delay = retry_delay(attempt, response)
+        if delay > RETRY_MAX_WAIT:
+            raise ProviderThrottled(f"{provider} asked to retry after {delay:.0f} seconds")
+        time.sleep(delay)
+    
+    if response.status_code >= 400 and response.status_code != 404:
+        raise ProviderError(f"{response.status_code} error from {url}")
+    
+    return response
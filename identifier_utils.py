@@ -0,0 +1,183 @@
+import re
+
+IDENTIFIER_TYPES = ('upc', 'isbn', 'imdb_id', 'tmdb_id')
+
+class InvalidIdentifier(ValueError):
+    """
+    Raised when an identifier is malformed or fails its checksum
+    """
+
+def gtin_check_digit(digits):
+    """
+    Compute the GS1 mod-10 check digit for a UPC/EAN body (all digits except the check digit)
+    """
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        total += int(digit) * (3 if position % 2 == 0 else 1)
+    return str((10 - total % 10) % 10)
+
+def is_valid_gtin(code):
+    """
+    Check the length and check digit of an EAN-8, UPC-A, EAN-13 or GTIN-14 code
+    """
+    return (
+        code.isdigit()
+        and len(code) in (8, 12, 13, 14)
+        and gtin_check_digit(code[:-1]) == code[-1]
+    )
+
+def expand_upc_e(code):
+    """
+    Expand a zero-suppressed UPC-E code (6, 7 or 8 digits) to its 12-digit UPC-A form
+    Raises InvalidIdentifier if the code cannot be UPC-E or its check digit is wrong
+    """
+    if not code.isdigit() or len(code) not in (6, 7, 8):
+        raise InvalidIdentifier('UPC-E codes have 6 to 8 digits')
+    
+    # 6 digits: body only; 7: number system + body; 8: number system + body + check digit
+    number_system = code[0] if len(code) >= 7 else '0'
+    body = code[1:7] if len(code) >= 7 else code
+    check_digit = code[7] if len(code) == 8 else None
+    
+    if number_system not in '01':
+        raise InvalidIdentifier('UPC-E number system must be 0 or 1')
+    
+    last = body[5]
+    if last in '012':
+        expanded = body[0:2] + last + '0000' + body[2:5]
+    elif last == '3':
+        expanded = body[0:3] + '00000' + body[3:5]
+    elif last == '4':
+        expanded = body[0:4] + '00000' + body[4]
+    else:
+        expanded = body[0:5] + '0000' + last
+    
+    upc_a = number_system + expanded
+    upc_a += gtin_check_digit(upc_a)
+    
+    if check_digit is not None and upc_a[-1] != check_digit:
+        raise InvalidIdentifier('UPC-E check digit does not match')
+    
+    return upc_a
+
+def isbn10_check_digit(digits):
+    """
+    Compute the mod-11 check character for the first nine digits of an ISBN-10
+    """
+    total = sum((10 - position) * int(digit) for position, digit in enumerate(digits))
+    check = (11 - total % 11) % 11
+    return 'X' if check == 10 else str(check)
+
+def isbn10_to_isbn13(isbn10):
+    """
+    Convert a valid ISBN-10 to its 978-prefixed ISBN-13
+    """
+    body = '978' + isbn10[:9]
+    return body + gtin_check_digit(body)
+
+def normalize_isbn(value):
+    """
+    Validate an ISBN-10 or ISBN-13 and return it as ISBN-13
+    """
+    isbn = re.sub(r'[\s-]', '', value).upper()
+    
+    if len(isbn) == 10 and isbn[:9].isdigit() and re.fullmatch(r'[0-9X]', isbn[9]):
+        if isbn10_check_digit(isbn[:9]) != isbn[9]:
+            raise InvalidIdentifier('ISBN-10 check digit does not match')
+        return isbn10_to_isbn13(isbn)
+    
+    if len(isbn) == 13 and isbn.isdigit():
+        if not isbn.startswith(('978', '979')):
+            raise InvalidIdentifier('ISBN-13 must start with 978 or 979')
+        if not is_valid_gtin(isbn):
+            raise InvalidIdentifier('ISBN-13 check digit does not match')
+        return isbn
+    
+    raise InvalidIdentifier('ISBN must have 10 or 13 digits')
+
+def normalize_upc(value, barcode_format=None):
+    """
+    Validate a UPC/EAN barcode and return its canonical form
+    UPC-A and UPC-E are widened to EAN-13, GTIN-14 with a zero indicator is narrowed to EAN-13,
+    and EAN-8 stays 8 digits. barcode_format is the scanner's format name (e.g. 'UPC_E'),
+    which settles whether an 8-digit code is EAN-8 or UPC-E
+    """
+    code = re.sub(r'[\s-]', '', value)
+    
+    if not code.isdigit():
+        raise InvalidIdentifier('Barcodes may only contain digits')
+    
+    if barcode_format == 'UPC_E' or len(code) in (6, 7):
+        return '0' + expand_upc_e(code)
+    
+    if len(code) == 8:
+        if is_valid_gtin(code):
+            return code
+        # An 8-digit code that is not a valid EAN-8 may still be a UPC-E
+        return '0' + expand_upc_e(code)
+    
+    if len(code) == 14 and code.startswith('0'):
+        code = code[1:]
+    
+    if len(code) not in (12, 13):
+        raise InvalidIdentifier('Barcodes must have 8, 12 or 13 digits')
+    
+    if not is_valid_gtin(code):
+        raise InvalidIdentifier('Barcode check digit does not match')
+    
+    return code.zfill(13)
+
+def normalize_imdb_id(value):
+    """
+    Canonicalize an IMDb title id, accepting bare numbers and imdb.com URLs
+    Returns 'tt' followed by at least seven digits
+    """
+    text = value.strip().lower()
+    match = re.search(r'tt(\d{1,10})', text) or re.fullmatch(r'(\d{1,10})', text)
+    if not match or int(match.group(1)) == 0:
+        raise InvalidIdentifier('IMDb ids look like tt0111161')
+    return 'tt' + match.group(1).zfill(7)
+
+def normalize_tmdb_id(value):
+    """
+    Canonicalize a TMDb movie id (a positive integer)
+    """
+    tmdb_id = value.strip()
+    if not tmdb_id.isdigit() or int(tmdb_id) == 0:
+        raise InvalidIdentifier('TMDb ids are positive numbers')
+    return str(int(tmdb_id))
+
+def normalize_identifier(identifier_type, value, barcode_format=None):
+    """
+    Validate an identifier and return its canonical form, used for lookups, cache keys and indexes
+    Raises InvalidIdentifier with a user-facing message if the identifier is invalid
+    """
+    value = (value or '').strip()
+    if not value:
+        raise InvalidIdentifier('Missing identifier')
+    
+    if identifier_type == 'upc':
+        return normalize_upc(value, barcode_format)
+    elif identifier_type == 'isbn':
+        return normalize_isbn(value)
+    elif identifier_type == 'imdb_id':
+        return normalize_imdb_id(value)
+    elif identifier_type == 'tmdb_id':
+        return normalize_tmdb_id(value)
+    
+    raise InvalidIdentifier('Invalid identifier type')
+
+def canonical_barcode(value):
+    """
+    Canonical barcode-index key for a stored UPC/EAN/ISBN, or None if it is not a valid code
+    ISBNs come out as ISBN-13, which shares the EAN-13 code space with retail barcodes
+    """
+    code = re.sub(r'[\s-]', '', value or '').upper()
+    
+    for normalize in (normalize_upc, normalize_isbn):
+        try:
+            return normalize(code)
+        except InvalidIdentifier:
+            continue
+    
+    return None
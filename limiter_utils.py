@@ -0,0 +1,256 @@
+import os
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# Limiter state is shared by every worker process through this SQLite file
+LIMITS_PATH = os.environ.get(
+    'PROVIDER_LIMITS_PATH',
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), 'provider_limits.sqlite3')
+)
+
+# Token buckets per provider: (tokens added per second, bucket size)
+RATE_LIMITS = {
+    'tmdb': (20, 40),
+    'omdb': (5, 10),
+}
+DEFAULT_RATE_LIMIT = (10, 20)
+
+# Longest a caller waits for a token before giving up (seconds)
+RATE_LIMIT_MAX_WAIT = 2.0
+
+# The breaker opens after this many failures within the window (seconds)
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_FAILURE_WINDOW = 30
+
+# How long an open breaker fails fast before letting one probe through (seconds)
+BREAKER_COOLDOWN = 30
+
+# A probe that has not reported back within this time is presumed lost (seconds)
+BREAKER_PROBE_TIMEOUT = 15
+
+class LimitStore:
+    """
+    Small SQLite store for limiter state, safe to share between threads and processes
+    Each thread gets its own connection; updates run in BEGIN IMMEDIATE transactions
+    """
+    
+    def __init__(self, path=LIMITS_PATH):
+        self.path = path
+        self._local = threading.local()
+    
+    def connection(self):
+        """
+        Return this thread's connection, creating the schema on first use
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    provider TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS circuit_breakers (
+                    provider TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    failures INTEGER NOT NULL,
+                    last_failure REAL NOT NULL,
+                    opened_at REAL NOT NULL
+                )
+            """)
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Run a read-modify-write under SQLite's write lock, so other processes see it atomically
+        """
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        else:
+            conn.execute('COMMIT')
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter per provider
+    """
+    
+    def __init__(self, store, limits=RATE_LIMITS, default_limit=DEFAULT_RATE_LIMIT):
+        self.store = store
+        self.limits = limits
+        self.default_limit = default_limit
+    
+    def try_acquire(self, provider):
+        """
+        Take a token if one is available
+        Returns 0 on success, otherwise the seconds until the next token
+        """
+        rate, capacity = self.limits.get(provider, self.default_limit)
+        now = time.time()
+        
+        with self.store.transaction() as conn:
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM rate_buckets WHERE provider = ?', (provider,)
+            ).fetchone()
+            
+            tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+            
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / rate
+            
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_buckets (provider, tokens, updated_at) VALUES (?, ?, ?)',
+                (provider, tokens, now)
+            )
+        
+        return wait
+    
+    def acquire(self, provider, max_wait=RATE_LIMIT_MAX_WAIT):
+        """
+        Take a token, sleeping until one is available
+        Returns False instead of waiting longer than max_wait seconds in total
+        """
+        deadline = time.time() + max_wait
+        
+        while True:
+            wait = self.try_acquire(provider)
+            if wait == 0:
+                return True
+            if time.time() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+class CircuitBreaker:
+    """
+    Circuit breaker per provider
+    closed: calls go through and failures are counted
+    open: calls fail fast until the cooldown has passed
+    half_open: one probe call goes through; its outcome closes or re-opens the breaker
+    """
+    
+    def __init__(self, store, threshold=BREAKER_FAILURE_THRESHOLD, window=BREAKER_FAILURE_WINDOW,
+                 cooldown=BREAKER_COOLDOWN, probe_timeout=BREAKER_PROBE_TIMEOUT):
+        self.store = store
+        self.threshold = threshold
+        self.window = window
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+    
+    def _read(self, conn, provider):
+        row = conn.execute(
+            'SELECT state, failures, last_failure, opened_at FROM circuit_breakers WHERE provider = ?',
+            (provider,)
+        ).fetchone()
+        return row or ('closed', 0, 0.0, 0.0)
+    
+    def _write(self, conn, provider, state, failures, last_failure, opened_at):
+        conn.execute(
+            'INSERT OR REPLACE INTO circuit_breakers (provider, state, failures, last_failure, opened_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (provider, state, failures, last_failure, opened_at)
+        )
+    
+    def state(self, provider):
+        """
+        Return the breaker state for a provider: 'closed', 'open' or 'half_open'
+        """
+        return self._read(self.store.connection(), provider)[0]
+    
+    def allow(self, provider):
+        """
+        Decide whether a call may go to the provider
+        After the cooldown exactly one caller is let through as the half-open probe
+        """
+        # Closed breakers need no write, keeping the common path cheap
+        if self.state(provider) == 'closed':
+            return True
+        
+        now = time.time()
+        with self.store.transaction() as conn:
+            state, failures, last_failure, opened_at = self._read(conn, provider)
+            
+            if state == 'closed':
+                return True
+            
+            # opened_at doubles as the probe start time while half-open
+            waited = now - opened_at
+            if (state == 'open' and waited >= self.cooldown) or (state == 'half_open' and waited >= self.probe_timeout):
+                self._write(conn, provider, 'half_open', failures, last_failure, now)
+                return True
+        
+        return False
+    
+    def record_success(self, provider):
+        """
+        Close the breaker after a successful call
+        """
+        state, failures, _, _ = self._read(self.store.connection(), provider)
+        if state == 'closed' and failures == 0:
+            return
+        
+        with self.store.transaction() as conn:
+            self._write(conn, provider, 'closed', 0, 0.0, 0.0)
+    
+    def record_failure(self, provider):
+        """
+        Count a failed call, opening the breaker once failures reach the threshold within the window
+        A failed half-open probe re-opens the breaker straight away
+        """
+        now = time.time()
+        with self.store.transaction() as conn:
+            state, failures, last_failure, opened_at = self._read(conn, provider)
+            
+            if now - last_failure > self.window:
+                failures = 0
+            failures += 1
+            
+            if state == 'half_open' or failures >= self.threshold:
+                self._write(conn, provider, 'open', failures, now, now)
+            else:
+                self._write(conn, provider, state, failures, now, opened_at)
+
+_store = None
+_rate_limiter = None
+_circuit_breaker = None
+_limits_lock = threading.Lock()
+
+def _get_limiters():
+    global _store, _rate_limiter, _circuit_breaker
+    
+    if _store is None:
+        with _limits_lock:
+            if _store is None:
+                store = LimitStore()
+                _rate_limiter = RateLimiter(store)
+                _circuit_breaker = CircuitBreaker(store)
+                _store = store
+    
+    return _rate_limiter, _circuit_breaker
+
+def get_rate_limiter():
+    """
+    Return the process-wide rate limiter
+    """
+    return _get_limiters()[0]
+
+def get_circuit_breaker():
+    """
+    Return the process-wide circuit breaker
+    """
+    return _get_limiters()[1]
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http_utils import provider_get, ProviderError
+
+# Most provider calls in flight at once, across all requests
+MAX_CONCURRENT_CALLS = 16
+
+# Longest a sync caller waits for a fan-out to finish (seconds)
+ENGINE_TIMEOUT = 30
+
+class ProviderEngine:
+    """
+    Asyncio event loop on a dedicated thread for fanning out provider calls concurrently
+    Blocking calls run on a worker pool sized to the concurrency cap, so they share the
+    keep-alive session, retries and error handling of provider_get
+    """
+    
+    def __init__(self, max_concurrency=MAX_CONCURRENT_CALLS):
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='provider-call')
+        )
+        self._thread = threading.Thread(target=self._run_loop, name='provider-engine', daemon=True)
+        self._thread.start()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+    
+    async def call(self, fn, *args):
+        """
+        Run a blocking function on the worker pool, waiting for a free slot under the global cap
+        """
+        if self._semaphore is None:
+            # Created on the loop thread, which is the only thread touching it
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        await self._semaphore.acquire()
+        try:
+            future = self._loop.run_in_executor(None, fn, *args)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        
+        # Cancelling the caller (e.g. a losing hedged lookup) cannot stop the worker thread,
+        # so the slot is only freed once the call itself has finished
+        future.add_done_callback(self._release_slot)
+        return await asyncio.shield(future)
+    
+    def _release_slot(self, future):
+        self._semaphore.release()
+        # Mark an abandoned call's error as retrieved, so asyncio does not log it
+        if not future.cancelled():
+            future.exception()
+    
+    async def get(self, url, params=None):
+        """
+        Send a provider GET request without blocking the loop
+        Raises ProviderError like provider_get
+        """
+        return await self.call(provider_get, url, params)
+    
+    def run(self, coro, timeout=ENGINE_TIMEOUT):
+        """
+        Run a coroutine on the engine loop and wait for its result from synchronous code
+        Raises ProviderError if it does not finish within timeout seconds
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError('ProviderEngine.run() cannot be called from the engine loop')
+        
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise ProviderError(f'Provider calls did not finish within {timeout} seconds')
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_provider_engine():
+    """
+    Return the process-wide provider engine, starting its loop thread on first use
+    """
+    global _engine
+    
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = ProviderEngine()
+    
+    return _engine
@@ -0,0 +1,119 @@
+import json
+
+# Criteria a smart collection can be defined by; a movie must satisfy every criterion given
+RULE_FIELDS = ('genres', 'directors', 'tags', 'formats', 'year_min', 'year_max', 'watch_status')
+
+# Criteria matching any one of several names
+LIST_RULES = ('genres', 'directors', 'tags', 'formats')
+
+RULE_LABELS = {
+    'genres': 'Genre',
+    'directors': 'Director',
+    'tags': 'Tag',
+    'formats': 'Format',
+}
+
+MIN_RULE_YEAR = 1800
+MAX_RULE_YEAR = 2100
+
+class InvalidRule(ValueError):
+    """
+    Raised when smart collection rules are malformed
+    """
+
+def parse_rule_list(value):
+    """
+    Parse a list criterion from a list or a comma-separated string, dropping blanks and repeats
+    """
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, (list, tuple)):
+        raise InvalidRule('List rules must be a list or a comma-separated string')
+    
+    names = {}
+    for name in value:
+        if not isinstance(name, str):
+            raise InvalidRule('List rules may only contain names')
+        name = name.strip()
+        if name:
+            names.setdefault(name.casefold(), name)
+    return list(names.values())
+
+def parse_rule_year(value):
+    """
+    Parse a year bound, allowing it to be left out
+    """
+    if value is None or value == '':
+        return None
+    try:
+        year = int(value)
+    except (TypeError, ValueError):
+        raise InvalidRule('Years must be whole numbers')
+    if not MIN_RULE_YEAR <= year <= MAX_RULE_YEAR:
+        raise InvalidRule(f'Years must be between {MIN_RULE_YEAR} and {MAX_RULE_YEAR}')
+    return year
+
+def parse_rules(data):
+    """
+    Validate smart collection rules from a dict or its JSON text
+    Returns the rules with empty criteria left out
+    Raises InvalidRule if they are malformed or define no criteria at all
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            raise InvalidRule('Rules must be valid JSON')
+    if not isinstance(data, dict):
+        raise InvalidRule('Rules must be an object')
+    
+    unknown = set(data) - set(RULE_FIELDS)
+    if unknown:
+        raise InvalidRule(f'Unknown rules: {", ".join(sorted(unknown))}')
+    
+    rules = {}
+    for field in LIST_RULES:
+        names = parse_rule_list(data.get(field) or [])
+        if names:
+            rules[field] = names
+    
+    for field in ('year_min', 'year_max'):
+        year = parse_rule_year(data.get(field))
+        if year is not None:
+            rules[field] = year
+    
+    if rules.get('year_min') and rules.get('year_max') and rules['year_min'] > rules['year_max']:
+        raise InvalidRule('The first year must not be after the last year')
+    
+    watch_status = data.get('watch_status')
+    if watch_status is not None:
+        if not isinstance(watch_status, bool):
+            raise InvalidRule('watch_status must be true or false')
+        rules['watch_status'] = watch_status
+    
+    if not rules:
+        raise InvalidRule('Smart collections need at least one rule')
+    
+    return rules
+
+def describe_rules(rules):
+    """
+    Describe rules as short human-readable phrases, e.g. ["Genre: Drama or Comedy", "1990-1999"]
+    """
+    phrases = []
+    for field in LIST_RULES:
+        if rules.get(field):
+            phrases.append(f'{RULE_LABELS[field]}: {" or ".join(rules[field])}')
+    
+    year_min, year_max = rules.get('year_min'), rules.get('year_max')
+    if year_min and year_max:
+        phrases.append(f'{year_min}-{year_max}' if year_min != year_max else f'{year_min}')
+    elif year_min:
+        phrases.append(f'{year_min} or later')
+    elif year_max:
+        phrases.append(f'{year_max} or earlier')
+    
+    if 'watch_status' in rules:
+        phrases.append('Watched' if rules['watch_status'] else 'Unwatched')
+    
+    return phrases
@@ -1,16 +1,45 @@
 import os
 import json
-import requests
+import asyncio
 from flask import request, jsonify, flash, redirect, url_for
+from http_utils import provider_get, ProviderError
+from cache_utils import get_provider_cache, make_cache_key
+from provider_engine import get_provider_engine
 
 # API key for The Movie Database (TMDb)
 TMDB_API_KEY = "6f1b33dc51fa128bb66f25f15d7ece66"  # This is a placeholder key, would need a real one in production
 OMDB_API_KEY = "a1b2c3d4"  # This is a placeholder key, would need a real one in production
 
+# Keyword searches fetch this many TMDB result pages at once
+KEYWORD_SEARCH_PAGES = 3
+
+# The top results of a keyword search are enriched with details and credits
+KEYWORD_DETAIL_RESULTS = 10
+
+# How identifiers answered by several providers are looked up:
+# 'race' returns the first good answer, 'merge' combines the answers in by the deadline
+IDENTIFIER_LOOKUP_STRATEGY = 'race'
+
+# When racing, the next provider is asked if the previous one has not answered within this delay (seconds)
+HEDGE_DELAY = 0.3
+
+# When merging, answers arriving after this deadline (seconds) are dropped
+MERGE_DEADLINE = 3.0
+
 def search_by_identifier(identifier_type, identifier_value):
     """
     Search for a movie using various identifiers (UPC, ISBN, IMDB ID, TMDB ID)
-    Returns movie data if found, None otherwise
+    Answers are served from the provider cache; concurrent identical lookups share one upstream call
+    Returns movie data if found, None otherwise; raises ProviderError when the providers cannot answer,
+    so an outage or rate limit is never reported as "no movie found"
+    """
+    key = make_cache_key('identifier', identifier_type, identifier_value)
+    return get_provider_cache().lookup(key, lambda: lookup_identifier(identifier_type, identifier_value))
+
+def lookup_identifier(identifier_type, identifier_value):
+    """
+    Look up an identifier directly with the providers, bypassing the cache
+    Returns movie data if found, None otherwise; raises ProviderError on outages
     """
     if identifier_type == 'upc':
         # UPC lookup could use a product database API
@@ -24,8 +53,8 @@ def search_by_identifier(identifier_type, identifier_value):
         return search_by_isbn(identifier_value)
     
     elif identifier_type == 'imdb_id':
-        # Search by IMDB ID using OMDB API
-        return search_by_imdb_id(identifier_value)
+        # Search by IMDB ID using OMDB API, with TMDB's /find endpoint as a second source
+        return lookup_with_strategy([search_by_imdb_id, find_by_imdb_id], identifier_value)
     
     elif identifier_type == 'tmdb_id':
         # Search by TMDB ID
@@ -33,6 +62,93 @@ def search_by_identifier(identifier_type, identifier_value):
     
     return None
 
+def lookup_with_strategy(lookups, identifier_value, strategy=None):
+    """
+    Look up an identifier with several providers in parallel on the provider engine
+    lookups are provider search functions in order of preference
+    Returns movie data if found, None otherwise; raises ProviderError if every provider failed
+    """
+    strategy = strategy or IDENTIFIER_LOOKUP_STRATEGY
+    
+    if strategy == 'merge':
+        coro = merge_lookups(lookups, identifier_value)
+    else:
+        coro = race_lookups(lookups, identifier_value)
+    
+    return get_provider_engine().run(coro)
+
+async def race_lookups(lookups, identifier_value, hedge_delay=HEDGE_DELAY):
+    """
+    Hedged requests: ask the providers in order, starting the next one whenever the
+    previous ones are slower than hedge_delay or come back empty, and return the first good answer
+    """
+    engine = get_provider_engine()
+    waiting = list(lookups)
+    running = set()
+    errors = []
+    
+    while waiting or running:
+        if waiting:
+            running.add(asyncio.ensure_future(engine.call(waiting.pop(0), identifier_value)))
+        
+        done, running = await asyncio.wait(
+            running,
+            timeout=hedge_delay if waiting else None,
+            return_when=asyncio.FIRST_COMPLETED
+        )
+        
+        for task in done:
+            if task.exception():
+                errors.append(task.exception())
+            elif task.result():
+                # The slower providers' answers are no longer needed
+                for other in running:
+                    other.cancel()
+                return task.result()
+    
+    if len(errors) == len(lookups):
+        raise errors[0]
+    
+    return None
+
+async def merge_lookups(lookups, identifier_value, deadline=MERGE_DEADLINE):
+    """
+    Ask all providers at once and merge the answers that arrive before the deadline
+    Fields missing from the preferred provider's answer are filled in from the others
+    """
+    engine = get_provider_engine()
+    tasks = [asyncio.ensure_future(engine.call(lookup, identifier_value)) for lookup in lookups]
+    
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    
+    results = [task.result() for task in tasks if task in done and not task.exception() and task.result()]
+    
+    if not results:
+        # A definite "not found" from any provider is an answer; otherwise this was an outage
+        if any(not task.exception() for task in done):
+            return None
+        errors = [task.exception() for task in done]
+        raise errors[0] if errors else ProviderError(f"No provider answered within {deadline} seconds")
+    
+    return merge_movie_results(results)
+
+def merge_movie_results(results):
+    """
+    Merge movie results from several providers, earlier results taking precedence
+    """
+    merged = {}
+    for result in results:
+        for key, value in result.items():
+            if key != 'json_data' and value and not merged.get(key):
+                merged[key] = value
+    
+    merged['found'] = True
+    merged['json_data'] = json.dumps(merged)
+    
+    return merged
+
 def search_by_upc(upc):
     """
     Search for a movie by UPC code
@@ -52,13 +168,15 @@ def search_by_upc(upc):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = provider_get(url, params=params)
         data = response.json()
         
         if response.status_code == 200 and data.get('results') and len(data['results']) > 0:
             # Take the first result
             movie_data = data['results'][0]
             return format_tmdb_result(movie_data)
+    except ProviderError:
+        raise
     except Exception as e:
         print(f"Error searching by UPC: {e}")
     
@@ -84,13 +202,15 @@ def search_by_isbn(isbn):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = provider_get(url, params=params)
         data = response.json()
         
         if response.status_code == 200 and data.get('results') and len(data['results']) > 0:
             # Take the first result
             movie_data = data['results'][0]
             return format_tmdb_result(movie_data)
+    except ProviderError:
+        raise
     except Exception as e:
         print(f"Error searching by ISBN: {e}")
     
@@ -112,16 +232,47 @@ def search_by_imdb_id(imdb_id):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = provider_get(url, params=params)
         data = response.json()
         
         if response.status_code == 200 and data.get('Response') == 'True':
             return format_omdb_result(data)
+    except ProviderError:
+        raise
     except Exception as e:
         print(f"Error searching by IMDB ID: {e}")
     
     return None
 
+def find_by_imdb_id(imdb_id):
+    """
+    Search for a movie by IMDB ID using TMDB's /find endpoint
+    """
+    url = f"https://api.themoviedb.org/3/find/{imdb_id}"
+    params = {
+        "api_key": TMDB_API_KEY,
+        "external_source": "imdb_id"
+    }
+    
+    try:
+        response = provider_get(url, params=params)
+        data = response.json()
+        
+        if response.status_code == 200 and data.get('movie_results'):
+            result = format_tmdb_result(data['movie_results'][0])
+            
+            # /find results do not carry the IMDB ID we searched for
+            result.pop('json_data')
+            result['imdb_id'] = imdb_id
+            result['json_data'] = json.dumps(result)
+            return result
+    except ProviderError:
+        raise
+    except Exception as e:
+        print(f"Error finding TMDB movie by IMDB ID: {e}")
+    
+    return None
+
 def search_by_tmdb_id(tmdb_id):
     """
     Search for a movie by TMDB ID
@@ -133,21 +284,44 @@ def search_by_tmdb_id(tmdb_id):
     }
     
     try:
-        response = requests.get(url, params=params)
+        response = provider_get(url, params=params)
         data = response.json()
         
         if response.status_code == 200 and data.get('id'):
             return format_tmdb_result(data, include_credits=True)
+    except ProviderError:
+        raise
     except Exception as e:
         print(f"Error searching by TMDB ID: {e}")
     
     return None
 
-def search_movies_by_keyword(query, page=1):
+def search_movies_by_keyword(query, page=1, pages=KEYWORD_SEARCH_PAGES):
     """
-    Search for movies by keyword/title using TMDB API
+    Search for movies by keyword/title using TMDB API, starting at page and spanning pages result pages
+    Answers are served from the provider cache; concurrent identical lookups share one upstream call
     Returns a list of movie results
     """
+    key = make_cache_key('keyword', query, page, pages)
+    
+    try:
+        return get_provider_cache().lookup(key, lambda: fetch_movies_by_keyword(query, page, pages))
+    except ProviderError as e:
+        print(f"Error searching movies by keyword: {e}")
+        return []
+
+def fetch_movies_by_keyword(query, page=1, pages=KEYWORD_SEARCH_PAGES, detail_results=KEYWORD_DETAIL_RESULTS):
+    """
+    Fetch keyword search results directly from TMDB, bypassing the cache
+    All pages are requested concurrently on the provider engine, then the top results are enriched
+    Returns a list of movie results; raises ProviderError on outages
+    """
+    return get_provider_engine().run(fetch_movies_by_keyword_async(query, page, pages, detail_results))
+
+async def fetch_keyword_page(query, page):
+    """
+    Fetch one page of raw TMDB keyword search results
+    """
     url = f"https://api.themoviedb.org/3/search/movie"
     params = {
         "api_key": TMDB_API_KEY,
@@ -156,22 +330,59 @@ def search_movies_by_keyword(query, page=1):
         "include_adult": "false"
     }
     
-    try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        if response.status_code == 200 and data.get('results'):
-            results = []
-            for movie_data in data['results']:
-                formatted_result = format_tmdb_result(movie_data)
-                if formatted_result:
-                    results.append(formatted_result)
-            return results
-    except Exception as e:
-        print(f"Error searching movies by keyword: {e}")
+    response = await get_provider_engine().get(url, params=params)
+    
+    if response.status_code == 200:
+        return response.json().get('results') or []
     
     return []
 
+async def fetch_movie_details(movie_data):
+    """
+    Enrich a raw TMDB search result with details and credits, falling back to the summary
+    Details come from the cached TMDB id lookup, so they are shared with identifier searches
+    """
+    details = await get_provider_engine().call(search_by_identifier, 'tmdb_id', str(movie_data['id']))
+    return details or format_tmdb_result(movie_data)
+
+async def fetch_movies_by_keyword_async(query, page=1, pages=KEYWORD_SEARCH_PAGES, detail_results=KEYWORD_DETAIL_RESULTS):
+    """
+    Fetch several TMDB result pages at once, then details and credits for the top results
+    Pages past the last one come back empty, so they are requested without knowing the page count
+    The first page's errors propagate; later pages that fail are skipped
+    """
+    page_results = await asyncio.gather(
+        *(fetch_keyword_page(query, number) for number in range(page, page + pages)),
+        return_exceptions=True
+    )
+    
+    if isinstance(page_results[0], BaseException):
+        raise page_results[0]
+    
+    # Merge the pages, dropping results repeated across pages
+    raw_results = []
+    seen = set()
+    for results in page_results:
+        if isinstance(results, BaseException):
+            print(f"Error searching movies by keyword: {results}")
+            continue
+        for movie_data in results:
+            if movie_data.get('id') not in seen:
+                seen.add(movie_data.get('id'))
+                raw_results.append(movie_data)
+    
+    detailed = await asyncio.gather(
+        *(fetch_movie_details(movie_data) for movie_data in raw_results[:detail_results])
+    )
+    
+    results = list(detailed)
+    for movie_data in raw_results[detail_results:]:
+        formatted_result = format_tmdb_result(movie_data)
+        if formatted_result:
+            results.append(formatted_result)
+    
+    return [result for result in results if result]
+
 def format_tmdb_result(movie_data, include_credits=False):
     """
     Format TMDB API result into a standardized format
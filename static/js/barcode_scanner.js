@@ -24,6 +24,12 @@ class MovieBarcodeScanner {
         
         // Store callbacks
         this.onScanSuccess = (decodedText, decodedResult) => {
+            // Ignore misreads that fail their check digit and keep scanning
+            if (!this.isValidScan(decodedText, decodedResult)) {
+                console.debug(`Ignoring invalid barcode read: ${decodedText}`);
+                return;
+            }
+            
             // Prevent duplicate scans of the same barcode
             if (this.lastResult !== decodedText) {
                 this.lastResult = decodedText;
@@ -45,6 +51,38 @@ class MovieBarcodeScanner {
         };
     }
 
+    /**
+     * Get the scanner's format name (e.g. 'EAN_13', 'UPC_E') for a decoded result
+     * @param {Object} decodedResult - Result object passed to the success callback
+     */
+    getFormatName(decodedResult) {
+        if (decodedResult && decodedResult.result && decodedResult.result.format) {
+            return decodedResult.result.format.formatName || null;
+        }
+        return null;
+    }
+    
+    /**
+     * Get the identifier type for a scanned barcode: Bookland EAN-13 codes are ISBNs
+     * @param {string} decodedText - The decoded barcode
+     */
+    getIdentifierType(decodedText) {
+        return /^97[89]\d{10}$/.test(decodedText) ? 'isbn' : 'upc';
+    }
+    
+    /**
+     * Check a decoded barcode's check digit before it is accepted
+     * @param {string} decodedText - The decoded barcode
+     * @param {Object} decodedResult - Result object passed to the success callback
+     */
+    isValidScan(decodedText, decodedResult) {
+        if (!window.MovieIdentifiers) {
+            return true;
+        }
+        const identifierType = this.getIdentifierType(decodedText);
+        return MovieIdentifiers.normalize(identifierType, decodedText, this.getFormatName(decodedResult)).valid;
+    }
+    
     /**
      * Start scanning with the camera
      * @param {boolean} useFrontCamera - Whether to use front camera on mobile (default: false)
@@ -0,0 +1,202 @@
+/**
+ * Movie Collection Identifier Validation
+ *
+ * Client-side mirror of identifier_utils.py. Scanner misreads and typos are
+ * rejected in the browser instead of costing a round-trip to the server.
+ */
+
+class InvalidIdentifierError extends Error {}
+
+const MovieIdentifiers = {
+    /**
+     * Compute the GS1 mod-10 check digit for a UPC/EAN body
+     * @param {string} digits - All digits except the check digit
+     */
+    gtinCheckDigit(digits) {
+        let total = 0;
+        digits.split('').reverse().forEach((digit, position) => {
+            total += Number(digit) * (position % 2 === 0 ? 3 : 1);
+        });
+        return String((10 - total % 10) % 10);
+    },
+    
+    /**
+     * Check the length and check digit of an EAN-8, UPC-A, EAN-13 or GTIN-14 code
+     */
+    isValidGtin(code) {
+        return /^\d+$/.test(code)
+            && [8, 12, 13, 14].includes(code.length)
+            && this.gtinCheckDigit(code.slice(0, -1)) === code.slice(-1);
+    },
+    
+    /**
+     * Expand a zero-suppressed UPC-E code (6, 7 or 8 digits) to UPC-A
+     */
+    expandUpcE(code) {
+        if (!/^\d{6,8}$/.test(code)) {
+            throw new InvalidIdentifierError('UPC-E codes have 6 to 8 digits');
+        }
+        
+        const numberSystem = code.length >= 7 ? code[0] : '0';
+        const body = code.length >= 7 ? code.slice(1, 7) : code;
+        const checkDigit = code.length === 8 ? code[7] : null;
+        
+        if (numberSystem !== '0' && numberSystem !== '1') {
+            throw new InvalidIdentifierError('UPC-E number system must be 0 or 1');
+        }
+        
+        const last = body[5];
+        let expanded;
+        if ('012'.includes(last)) {
+            expanded = body.slice(0, 2) + last + '0000' + body.slice(2, 5);
+        } else if (last === '3') {
+            expanded = body.slice(0, 3) + '00000' + body.slice(3, 5);
+        } else if (last === '4') {
+            expanded = body.slice(0, 4) + '00000' + body[4];
+        } else {
+            expanded = body.slice(0, 5) + '0000' + last;
+        }
+        
+        let upcA = numberSystem + expanded;
+        upcA += this.gtinCheckDigit(upcA);
+        
+        if (checkDigit !== null && upcA.slice(-1) !== checkDigit) {
+            throw new InvalidIdentifierError('UPC-E check digit does not match');
+        }
+        
+        return upcA;
+    },
+    
+    /**
+     * Compute the mod-11 check character for the first nine digits of an ISBN-10
+     */
+    isbn10CheckDigit(digits) {
+        let total = 0;
+        digits.split('').forEach((digit, position) => {
+            total += (10 - position) * Number(digit);
+        });
+        const check = (11 - total % 11) % 11;
+        return check === 10 ? 'X' : String(check);
+    },
+    
+    /**
+     * Validate an ISBN-10 or ISBN-13 and return it as ISBN-13
+     */
+    normalizeIsbn(value) {
+        const isbn = value.replace(/[\s-]/g, '').toUpperCase();
+        
+        if (/^\d{9}[\dX]$/.test(isbn)) {
+            if (this.isbn10CheckDigit(isbn.slice(0, 9)) !== isbn[9]) {
+                throw new InvalidIdentifierError('ISBN-10 check digit does not match');
+            }
+            const body = '978' + isbn.slice(0, 9);
+            return body + this.gtinCheckDigit(body);
+        }
+        
+        if (/^\d{13}$/.test(isbn)) {
+            if (!isbn.startsWith('978') && !isbn.startsWith('979')) {
+                throw new InvalidIdentifierError('ISBN-13 must start with 978 or 979');
+            }
+            if (!this.isValidGtin(isbn)) {
+                throw new InvalidIdentifierError('ISBN-13 check digit does not match');
+            }
+            return isbn;
+        }
+        
+        throw new InvalidIdentifierError('ISBN must have 10 or 13 digits');
+    },
+    
+    /**
+     * Validate a UPC/EAN barcode and return its canonical form
+     * @param {string} value - The barcode
+     * @param {string|null} barcodeFormat - Scanner format name, e.g. 'UPC_E'
+     */
+    normalizeUpc(value, barcodeFormat = null) {
+        let code = value.replace(/[\s-]/g, '');
+        
+        if (!/^\d+$/.test(code)) {
+            throw new InvalidIdentifierError('Barcodes may only contain digits');
+        }
+        
+        if (barcodeFormat === 'UPC_E' || code.length === 6 || code.length === 7) {
+            return '0' + this.expandUpcE(code);
+        }
+        
+        if (code.length === 8) {
+            return this.isValidGtin(code) ? code : '0' + this.expandUpcE(code);
+        }
+        
+        if (code.length === 14 && code.startsWith('0')) {
+            code = code.slice(1);
+        }
+        
+        if (code.length !== 12 && code.length !== 13) {
+            throw new InvalidIdentifierError('Barcodes must have 8, 12 or 13 digits');
+        }
+        
+        if (!this.isValidGtin(code)) {
+            throw new InvalidIdentifierError('Barcode check digit does not match');
+        }
+        
+        return code.padStart(13, '0');
+    },
+    
+    /**
+     * Canonicalize an IMDb title id, accepting bare numbers and imdb.com URLs
+     */
+    normalizeImdbId(value) {
+        const text = value.trim().toLowerCase();
+        const match = text.match(/tt(\d{1,10})/) || text.match(/^(\d{1,10})$/);
+        if (!match || Number(match[1]) === 0) {
+            throw new InvalidIdentifierError('IMDb ids look like tt0111161');
+        }
+        return 'tt' + match[1].padStart(7, '0');
+    },
+    
+    /**
+     * Canonicalize a TMDb movie id
+     */
+    normalizeTmdbId(value) {
+        const tmdbId = value.trim();
+        if (!/^\d+$/.test(tmdbId) || Number(tmdbId) === 0) {
+            throw new InvalidIdentifierError('TMDb ids are positive numbers');
+        }
+        return String(Number(tmdbId));
+    },
+    
+    /**
+     * Validate an identifier and return its canonical form
+     * @returns {{valid: boolean, value: string|null, message: string|null}}
+     */
+    normalize(identifierType, value, barcodeFormat = null) {
+        try {
+            const trimmed = (value || '').trim();
+            if (!trimmed) {
+                throw new InvalidIdentifierError('Missing identifier');
+            }
+            
+            let normalized;
+            if (identifierType === 'upc') {
+                normalized = this.normalizeUpc(trimmed, barcodeFormat);
+            } else if (identifierType === 'isbn') {
+                normalized = this.normalizeIsbn(trimmed);
+            } else if (identifierType === 'imdb_id') {
+                normalized = this.normalizeImdbId(trimmed);
+            } else if (identifierType === 'tmdb_id') {
+                normalized = this.normalizeTmdbId(trimmed);
+            } else {
+                throw new InvalidIdentifierError('Invalid identifier type');
+            }
+            
+            return { valid: true, value: normalized, message: null };
+        } catch (err) {
+            if (err instanceof InvalidIdentifierError) {
+                return { valid: false, value: null, message: err.message };
+            }
+            throw err;
+        }
+    }
+};
+
+// Export the validator
+window.MovieIdentifiers = MovieIdentifiers;
@@ -21,8 +21,69 @@ document.addEventListener('DOMContentLoaded', function() {
             bsAlert.close();
         });
     }, 5000);
+    
+    // Attach typeahead suggestions
+    document.querySelectorAll('input[data-suggest]').forEach(initSuggestions);
 });
 
+// Function to attach /api/suggest completions to an input through a datalist
+// data-suggest lists the kinds to complete (e.g. "person"); data-suggest-multiple
+// completes the last entry of a comma-separated list
+var suggestionListCount = 0;
+
+function initSuggestions(input) {
+    // Numbered ids keep inputs sharing a name (like the navbar and page search boxes) apart
+    var datalist = document.createElement('datalist');
+    suggestionListCount += 1;
+    datalist.id = 'suggestions-' + suggestionListCount;
+    input.parentNode.appendChild(datalist);
+    input.setAttribute('list', datalist.id);
+    input.setAttribute('autocomplete', 'off');
+    
+    var multiple = input.hasAttribute('data-suggest-multiple');
+    var timer = null;
+    var controller = null;
+    
+    input.addEventListener('input', function() {
+        clearTimeout(timer);
+        timer = setTimeout(function() {
+            // Only the entry being typed is completed; earlier entries are kept as they are
+            var parts = multiple ? input.value.split(',') : [input.value];
+            var current = parts.pop().trim();
+            var head = parts.length ? parts.map(part => part.trim()).join(', ') + ', ' : '';
+            
+            if (current.length < 2) {
+                datalist.innerHTML = '';
+                return;
+            }
+            
+            // Drop the answer to a stale keystroke
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            
+            var params = new URLSearchParams({ q: current, kinds: input.dataset.suggest });
+            fetch('/api/suggest?' + params.toString(), { signal: controller.signal })
+                .then(response => response.json())
+                .then(data => {
+                    datalist.innerHTML = '';
+                    data.suggestions.forEach(function(suggestion) {
+                        var option = document.createElement('option');
+                        option.value = head + suggestion.label;
+                        option.label = suggestion.kind;
+                        datalist.appendChild(option);
+                    });
+                })
+                .catch(error => {
+                    if (error.name !== 'AbortError') {
+                        console.error('Error:', error);
+                    }
+                });
+        }, 80);
+    });
+}
+
 // Function to preview image before upload
 function previewImage(input, previewId) {
     if (input.files && input.files[0]) {
@@ -0,0 +1,99 @@
+import re
+import bisect
+import threading
+import unicodedata
+
+SUGGESTION_KINDS = ('title', 'person', 'genre')
+
+# Titles rank first, then people, then genres
+KIND_ORDER = {kind: position for position, kind in enumerate(SUGGESTION_KINDS)}
+
+DEFAULT_SUGGESTION_LIMIT = 10
+
+# Index entries examined per kind and lookup, so very short prefixes stay cheap
+MAX_SCANNED_ENTRIES = 500
+
+def suggestion_key(text):
+    """
+    Normalize text for prefix matching: casefolded, accents stripped, punctuation collapsed to spaces
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(re.findall(r'\w+', stripped.casefold()))
+
+class PrefixIndex:
+    """
+    In-memory completion index over titles, people and genres
+    One sorted list of (key, label, word position) entries per kind, searched with bisect; every word
+    of a label starts an entry, so "hanks" completes "Tom Hanks" as well as "tom" does
+    Keeping kinds apart means thousands of matching people never crowd a genre out of a genre-only lookup
+    """
+    
+    def __init__(self):
+        self._entries = {kind: [] for kind in SUGGESTION_KINDS}
+        self._labels = set()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._labels)
+    
+    def _label_entries(self, label):
+        words = suggestion_key(label).split()
+        return [(' '.join(words[start:]), label, start) for start in range(len(words))]
+    
+    def build(self, items):
+        """
+        Replace the index contents with (kind, label) pairs in one sort
+        """
+        labels = {(kind, label) for kind, label in items if label}
+        entries = {kind: [] for kind in SUGGESTION_KINDS}
+        for kind, label in labels:
+            entries[kind].extend(self._label_entries(label))
+        for kind_entries in entries.values():
+            kind_entries.sort()
+        
+        with self._lock:
+            self._labels = labels
+            self._entries = entries
+    
+    def add(self, kind, label):
+        """
+        Add one label, keeping the entries sorted
+        """
+        if not label:
+            return
+        
+        with self._lock:
+            if (kind, label) in self._labels:
+                return
+            self._labels.add((kind, label))
+            for entry in self._label_entries(label):
+                bisect.insort(self._entries[kind], entry)
+    
+    def suggest(self, prefix, limit=DEFAULT_SUGGESTION_LIMIT, kinds=SUGGESTION_KINDS):
+        """
+        Return up to limit (kind, label) completions for a prefix
+        Labels that start with the prefix rank before those matching at a later word, then shorter labels first
+        """
+        key = suggestion_key(prefix)
+        if not key:
+            return []
+        
+        matches = {}
+        with self._lock:
+            for kind in kinds:
+                entries = self._entries[kind]
+                position = bisect.bisect_left(entries, (key,))
+                end = min(position + MAX_SCANNED_ENTRIES, len(entries))
+                
+                while position < end:
+                    entry_key, label, start = entries[position]
+                    if not entry_key.startswith(key):
+                        break
+                    rank = (KIND_ORDER[kind], start > 0, len(label), label)
+                    if (kind, label) not in matches or rank < matches[(kind, label)]:
+                        matches[(kind, label)] = rank
+                    position += 1
+        
+        ranked = sorted(matches.items(), key=lambda item: item[1])
+        return [suggestion for suggestion, _ in ranked[:limit]]
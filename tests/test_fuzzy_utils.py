@@ -0,0 +1,104 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzy_utils import CANDIDATE_THRESHOLD, TitleIndex, normalize_title, title_trigrams, years_compatible
+
+WORDS = ['the', 'man', 'night', 'love', 'of', 'dark', 'story', 'last', 'city', 'war', 'house', 'girl',
+         'blood', 'king', 'return', 'star', 'dead', 'time', 'dream', 'river', 'ghost', 'secret', 'road']
+
+class CountingList(list):
+    """
+    List counting item lookups, i.e. how many indexed titles a query inspected
+    """
+    
+    reads = 0
+    
+    def __getitem__(self, position):
+        self.reads += 1
+        return super().__getitem__(position)
+
+def random_titles(count, seed):
+    generator = random.Random(seed)
+    return [' '.join(generator.choice(WORDS) for _ in range(generator.randint(1, 4))) + f' {number}'
+            for number in range(count)]
+
+def brute_force(titles, title, threshold):
+    key = normalize_title(title)
+    trigrams = title_trigrams(key)
+    scores = {}
+    for position, other in enumerate(titles):
+        other_key = normalize_title(other)
+        other_trigrams = title_trigrams(other_key)
+        score = 1.0 if other_key == key else 2 * len(trigrams & other_trigrams) / (len(trigrams) + len(other_trigrams))
+        if score >= threshold:
+            scores[position] = score
+    return scores
+
+def test_candidates_match_brute_force():
+    titles = random_titles(800, seed=1)
+    index = TitleIndex()
+    for position, title in enumerate(titles):
+        index.add(title, payload=position)
+    
+    for query in random_titles(30, seed=2) + ['the dark night', 'return of the king', 'x']:
+        for threshold in (CANDIDATE_THRESHOLD, 0.8):
+            expected = brute_force(titles, query, threshold)
+            found = {payload: score for score, _, _, payload in index.candidates(query, threshold=threshold, limit=None)}
+            assert found.keys() == expected.keys()
+            assert all(abs(found[position] - expected[position]) < 1e-9 for position in found)
+
+def inspected(library_size, query):
+    index = TitleIndex()
+    index._titles = CountingList()
+    for number in range(library_size):
+        index.add(f'The Night of the {WORDS[number % len(WORDS)]} {number}')
+    index.add('Nightcrawler', 2014)
+    
+    index._titles.reads = 0
+    matches = index.candidates(query, threshold=0.8)
+    return index._titles.reads, matches
+
+def test_lookups_do_not_scan_titles_sharing_common_trigrams():
+    small_reads, small_matches = inspected(2000, 'Nightcrawler')
+    large_reads, large_matches = inspected(40000, 'Nightcrawler')
+    
+    assert [match[1] for match in small_matches] == ['Nightcrawler']
+    assert [match[1] for match in large_matches] == ['Nightcrawler']
+    # Every title shares "nig"/"igh"/"ght" with the query, yet 20x the library inspects no more titles
+    assert large_reads == small_reads
+    assert large_reads < 10
+
+def test_exact_and_edition_matches():
+    index = TitleIndex()
+    index.add('Alien', 1979, payload=1)
+    index.add('Aliens', 1986, payload=2)
+    
+    assert index.find_duplicate("Alien (Director's Cut)", 1979)[3] == 1
+    assert index.find_duplicate('Alien', 1986) is None
+    assert years_compatible(1979, 1980) and not years_compatible(1979, 1981)
+
+def test_only_bracketed_years_are_edition_qualifiers():
+    assert normalize_title('Blade Runner (1982)') == 'blade runner'
+    assert normalize_title('Blade Runner: 2049') == 'blade runner 2049'
+    assert normalize_title('Blade Runner - 2049') == 'blade runner 2049'
+    
+    index = TitleIndex()
+    index.add('Blade Runner', 1982)
+    assert index.find_duplicate('Blade Runner: 2049', 2017) is None
+    assert index.find_duplicate('Blade Runner: 2049', None, require_years=True) is None
+
+def test_import_dedup_requires_years_for_near_matches():
+    index = TitleIndex()
+    index.add('Crash', 1996)
+    index.add('The Thing', None)
+    
+    # Browsing treats an unknown year as compatible, importing does not
+    assert index.find_duplicate('Crash', None) is not None
+    assert index.find_duplicate('Crash', None, require_years=True) is None
+    assert index.find_duplicate('Crash', 2004, require_years=True) is None
+    assert index.find_duplicate('Crash', 1997, require_years=True)[2] == 1996
+    assert index.find_duplicate('Thing', None, require_years=True)[1] == 'The Thing'
+    assert index.find_duplicate('The Thing', 1982, require_years=True) is None
@@ -0,0 +1,64 @@
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Keep the test database and provider stores out of the working tree
+_tmpdir = tempfile.mkdtemp()
+os.environ.setdefault('MOVIE_DB_PATH', os.path.join(_tmpdir, 'movies.sqlite3'))
+os.environ.setdefault('PROVIDER_CACHE_PATH', os.path.join(_tmpdir, 'provider_cache.sqlite3'))
+os.environ.setdefault('PROVIDER_LIMITS_PATH', os.path.join(_tmpdir, 'provider_limits.sqlite3'))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import search_utils
+from app import app, db
+from http_utils import ProviderThrottled
+
+@pytest.fixture
+def client(monkeypatch):
+    def lookup_identifier(identifier_type, identifier_value):
+        if identifier_value.endswith('9'):
+            raise ProviderThrottled('TMDB rate limit exceeded')
+        return None
+    
+    monkeypatch.setattr(search_utils, 'lookup_identifier', lookup_identifier)
+    
+    with app.app_context():
+        db.create_all()
+    yield app.test_client()
+
+def test_throttled_lookup_is_unavailable_not_missing(client):
+    data = client.get('/api/search/tmdb_id/4109').get_json()
+    assert data['success'] is False and data['unavailable'] is True
+    
+    data = client.get('/api/search/tmdb_id/4100').get_json()
+    assert data['success'] is False and 'unavailable' not in data
+    assert data['message'].startswith('No movie found')
+
+def test_batch_marks_throttled_lookups_unavailable(client):
+    response = client.post('/api/search/batch', json={'items': [
+        {'type': 'tmdb_id', 'value': '5109'},
+        {'type': 'tmdb_id', 'value': '5100'},
+    ]})
+    lines = {line['index']: line for line in map(json.loads, response.get_data(as_text=True).splitlines())}
+    
+    assert lines[0]['unavailable'] is True
+    assert 'unavailable' not in lines[1] and lines[1]['message'].startswith('No movie found')
+
+def test_unconfirmed_scan_results_expire(client):
+    from datetime import datetime
+    from app import SCAN_RESULT_TTL, Barcode, remember_barcode_result, resolve_barcode, resolve_barcodes
+    
+    barcode = '0883929106288'
+    with app.app_context():
+        remember_barcode_result('upc', barcode, {'title': 'Inception', 'tmdb_id': '27205'})
+        db.session.commit()
+        assert resolve_barcode(barcode)['title'] == 'Inception'
+        
+        db.session.get(Barcode, barcode).last_seen = datetime.utcnow() - SCAN_RESULT_TTL
+        db.session.commit()
+        assert resolve_barcode(barcode) is None
+        assert resolve_barcodes([barcode]) == {}
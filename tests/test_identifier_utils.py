@@ -0,0 +1,56 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from identifier_utils import InvalidIdentifier, canonical_barcode, normalize_identifier
+
+# Shared with the browser mirror in static/js/identifiers.js
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'identifier_vectors.json')) as vectors_file:
+    VECTORS = json.load(vectors_file)
+
+# Runs every vector through MovieIdentifiers.normalize and prints the results as JSON
+NODE_SCRIPT = """
+const fs = require('fs');
+const vm = require('vm');
+const [script, vectors] = process.argv.slice(1);
+const context = { window: {} };
+vm.runInNewContext(fs.readFileSync(script, 'utf8'), context);
+const cases = JSON.parse(fs.readFileSync(vectors, 'utf8'));
+console.log(JSON.stringify(cases.map(c => context.window.MovieIdentifiers.normalize(c.type, c.value, c.format || null))));
+"""
+
+@pytest.mark.parametrize('vector', VECTORS, ids=lambda vector: f"{vector['type']}:{vector['value']}")
+def test_normalize_identifier(vector):
+    if vector['expected'] is None:
+        with pytest.raises(InvalidIdentifier) as error:
+            normalize_identifier(vector['type'], vector['value'], vector.get('format'))
+        assert str(error.value) == vector['error']
+    else:
+        assert normalize_identifier(vector['type'], vector['value'], vector.get('format')) == vector['expected']
+
+def test_canonical_barcode_matches_lookups():
+    assert canonical_barcode('0-306-40615-2') == canonical_barcode('978-0-306-40615-7') == '9780306406157'
+    assert canonical_barcode('036000291452') == normalize_identifier('upc', '036000291452')
+    assert canonical_barcode('036000291453') is None
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_javascript_mirror_agrees():
+    output = subprocess.run(
+        ['node', '-e', NODE_SCRIPT, os.path.join(ROOT, 'static', 'js', 'identifiers.js'),
+         os.path.join(os.path.dirname(os.path.abspath(__file__)), 'identifier_vectors.json')],
+        capture_output=True, text=True, check=True
+    ).stdout
+    
+    for vector, result in zip(VECTORS, json.loads(output)):
+        assert result == {
+            'valid': vector['expected'] is not None,
+            'value': vector['expected'],
+            'message': vector.get('error'),
+        }, vector
@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Keep the test database and provider stores out of the working tree
+_tmpdir = tempfile.mkdtemp()
+os.environ['MOVIE_DB_PATH'] = os.path.join(_tmpdir, 'movies.sqlite3')
+os.environ['PROVIDER_CACHE_PATH'] = os.path.join(_tmpdir, 'provider_cache.sqlite3')
+os.environ['PROVIDER_LIMITS_PATH'] = os.path.join(_tmpdir, 'provider_limits.sqlite3')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app import app, db, Collection, MovieCollection, MoviePerson, MovieTag, Tag, bulk_import_movies, group_credits, load_movie_detail
+
+@pytest.fixture
+def movie_id():
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        
+        [movie_id] = bulk_import_movies([{
+            'title': 'Heat',
+            'release_year': 1995,
+            'genres': ['Crime', 'Drama'],
+            'directors': ['Michael Mann'],
+            'cast': ['Al Pacino', 'Robert De Niro'],
+        }])
+        
+        tag = Tag(name='favorite')
+        collection = Collection(name='Nineties')
+        db.session.add_all([tag, collection])
+        db.session.flush()
+        db.session.add(MovieTag(movie_id=movie_id, tag_id=tag.tag_id))
+        db.session.add(MovieCollection(movie_id=movie_id, collection_id=collection.collection_id))
+        
+        credit = db.session.scalars(
+            db.select(MoviePerson).where(MoviePerson.movie_id == movie_id, MoviePerson.role_type == 'actor')
+        ).first()
+        credit.character_name = 'Vincent Hanna'
+        db.session.commit()
+        
+        yield movie_id
+        
+        db.session.remove()
+        db.drop_all()
+
+def test_detail_loader_groups_credits_in_fixed_queries(movie_id):
+    with app.app_context():
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            movie = load_movie_detail(movie_id)
+            credits = group_credits(movie.credits)
+            names = {role: sorted(credit.person.name for credit in role_credits)
+                     for role, role_credits in credits.items()}
+            genres = sorted(genre.name for genre in movie.genres)
+            tags = [tag.name for tag in movie.tags]
+            collections = [collection.name for collection in movie.collections]
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+    
+    assert names == {'director': ['Michael Mann'], 'actor': ['Al Pacino', 'Robert De Niro']}
+    assert genres == ['Crime', 'Drama']
+    assert tags == ['favorite']
+    assert collections == ['Nineties']
+    assert len(statements) == 5
+
+def test_movie_detail_page_renders_grouped_credits(movie_id):
+    response = app.test_client().get(f'/movie/{movie_id}')
+    
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    directors = html[html.index('Directors:'):html.index('Cast:')]
+    cast = html[html.index('Cast:'):]
+    assert 'Michael Mann' in directors and 'Al Pacino' not in directors
+    assert 'Al Pacino' in cast and 'Robert De Niro' in cast
+    assert 'as Vincent Hanna' in cast
+    assert 'favorite' in html and 'Nineties' in html
+
+def test_missing_movie_is_404(movie_id):
+    assert app.test_client().get('/movie/999999').status_code == 404
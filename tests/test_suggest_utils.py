@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from suggest_utils import MAX_SCANNED_ENTRIES, PrefixIndex
+
+def test_kind_filter_is_not_crowded_out_by_other_kinds():
+    index = PrefixIndex()
+    index.build([('person', f'Nat Cole{number}') for number in range(MAX_SCANNED_ENTRIES + 100)] + [('genre', 'Comedy')])
+    
+    assert index.suggest('co', kinds=('genre',)) == [('genre', 'Comedy')]
+    assert ('genre', 'Comedy') in index.suggest('co', limit=1000)
+
+def test_suggestions_rank_kinds_then_leading_words():
+    index = PrefixIndex()
+    index.build([('person', 'Tom Hanks'), ('title', 'Hannibal'), ('genre', 'Horror'), ('person', 'Colin Hanks')])
+    index.add('title', 'Hanna')
+    
+    assert index.suggest('han') == [('title', 'Hanna'), ('title', 'Hannibal'), ('person', 'Tom Hanks'),
+                                    ('person', 'Colin Hanks')]
+    assert index.suggest('han', kinds=('person',)) == [('person', 'Tom Hanks'), ('person', 'Colin Hanks')]
+    assert index.suggest('Ho') == [('genre', 'Horror')]
+    assert len(index) == 5